@@ -0,0 +1,336 @@
+"""
+Incremental price analytics for the annex datasets.
+
+PriceAnalytics keeps running aggregates over the annex3 wholesale prices and
+updates them from newly appended rows only, so a refresh costs O(new rows)
+instead of recomputing everything over the full history:
+
+- per-item mean / variance (Welford, merged batch-wise with Chan's formula)
+- daily average market price (running per-day sums and counts)
+- per-item rolling mean / std over the last `window` observations
+- per-item forward/back fill state, matching the notebook cleaning
+- loss-adjusted effective cost per category, joining annex4 loss rates
+  and annex1 categories once by item position
+
+Usage:
+    from annex_analytics import PriceAnalytics
+    engine = PriceAnalytics.from_annex()   # loads state from .annex_cache/ when present
+    engine.refresh()                       # reads only the rows appended to annex3.csv
+    engine.volatility().head(15)
+    engine.save()
+"""
+
+import hashlib
+import io
+import os
+import pickle
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import annex_data
+
+ANNEX3_PATH = os.path.join(annex_data.ROOT_DIR, "annex3.csv")
+STATE_PATH = os.path.join(annex_data.CACHE_DIR, "price_analytics.pkl")
+
+DATE = "Date"
+ITEM = "Item Code"
+PRICE = "Wholesale Price (RMB/kg)"
+
+
+class PriceAnalytics:
+    def __init__(self, items=None, loss_rates=None, window=7):
+        """
+        `items` is the annex1 table (Item Code -> Category Name) and `loss_rates` the
+        annex4 table (Item Code -> Loss Rate (%)); both are only needed for
+        effective_cost_by_category().
+        """
+        self.window = window
+        self._item_categories = (
+            items.assign(**{ITEM: items[ITEM].astype("int64")}).set_index(ITEM)["Category Name"].astype(str)
+            if items is not None else pd.Series(dtype=str)
+        )
+        self._item_loss = (
+            loss_rates.assign(**{ITEM: loss_rates[ITEM].astype("int64")}).set_index(ITEM)["Loss Rate (%)"].astype("float64")
+            if loss_rates is not None else pd.Series(dtype="float64")
+        )
+        self.reset()
+
+    @classmethod
+    def from_annex(cls, window=7, state_path=STATE_PATH):
+        """Restores saved state if present, otherwise builds from the annex tables."""
+        if state_path and os.path.exists(state_path):
+            with open(state_path, "rb") as f:
+                engine = pickle.load(f)
+            if engine.window == window:
+                return engine
+        return cls(annex_data.load_items(), annex_data.load_loss_rates(), window=window)
+
+    def save(self, state_path=STATE_PATH):
+        os.makedirs(os.path.dirname(state_path), exist_ok=True)
+        with open(state_path, "wb") as f:
+            pickle.dump(self, f)
+
+    def reset(self):
+        # Item positions index every per-item array below
+        self._items = pd.Index([], dtype="int64")
+        self._n = np.zeros(0, dtype=np.int64)
+        self._mean = np.zeros(0, dtype=np.float64)
+        self._m2 = np.zeros(0, dtype=np.float64)
+        self._last_price = np.zeros(0, dtype=np.float64)
+        # Ring buffer of each item's last `window` prices; _window_filled counts writes per item
+        self._window_prices = np.full((0, self.window), np.nan)
+        self._window_filled = np.zeros(0, dtype=np.int64)
+        # Per-date running sums for the market average, keyed by datetime64[ns] as int
+        self._day_sum = {}
+        self._day_count = {}
+        # Rows with no price yet (nothing to carry forward); back filled by a later batch
+        self._pending = (
+            np.zeros(0, dtype="datetime64[ns]"),
+            np.zeros(0, dtype=np.int64),
+            np.zeros(0, dtype=np.float64),
+        )
+        self.rows_seen = 0
+        self._source_offset = 0
+        self._source_fingerprint = None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _positions(self, codes):
+        new_items = pd.Index(np.unique(codes)).difference(self._items)
+        if len(new_items):
+            self._items = self._items.append(new_items)
+            grow = len(new_items)
+            self._n = np.concatenate([self._n, np.zeros(grow, dtype=np.int64)])
+            self._mean = np.concatenate([self._mean, np.zeros(grow)])
+            self._m2 = np.concatenate([self._m2, np.zeros(grow)])
+            self._last_price = np.concatenate([self._last_price, np.full(grow, np.nan)])
+            self._window_prices = np.vstack([self._window_prices, np.full((grow, self.window), np.nan)])
+            self._window_filled = np.concatenate([self._window_filled, np.zeros(grow, dtype=np.int64)])
+        return self._items.get_indexer(codes)
+
+    def update(self, rows):
+        """
+        Folds newly appended rows (Date, Item Code, Wholesale Price) into the aggregates.
+        Rows must not predate what was already seen for the same item. Returns the number
+        of rows folded in after the notebook cleaning (filled prices, non-positive dropped).
+        """
+        dates = np.asarray(rows[DATE], dtype="datetime64[ns]")
+        codes = np.asarray(rows[ITEM], dtype=np.int64)
+        prices = np.asarray(rows[PRICE], dtype=np.float64)
+        self.rows_seen += len(codes)
+        if len(self._pending[0]):
+            dates, codes, prices = (np.concatenate(pair) for pair in zip(self._pending, (dates, codes, prices)))
+        if not len(codes):
+            return 0
+
+        pos = self._positions(codes)
+        order = np.lexsort((dates, pos))
+        dates, codes, prices, pos = dates[order], codes[order], prices[order], pos[order]
+
+        # Item runs in the sorted batch: index of each row's first and last row of its item
+        rows_idx = np.arange(len(pos))
+        is_first = np.r_[True, pos[1:] != pos[:-1]]
+        is_last = np.r_[pos[1:] != pos[:-1], True]
+        run_start = np.maximum.accumulate(np.where(is_first, rows_idx, 0))
+        run_end = np.minimum.accumulate(np.where(is_last, rows_idx, len(pos))[::-1])[::-1]
+
+        # Forward fill within the item, then from its last known price, then back fill leading gaps
+        known = ~np.isnan(prices)
+        prev = np.maximum.accumulate(np.where(known, rows_idx, -1))
+        prices = np.where(prev >= run_start, prices[np.maximum(prev, 0)], self._last_price[pos])
+        known = ~np.isnan(prices)
+        nxt = np.minimum.accumulate(np.where(known, rows_idx, len(pos))[::-1])[::-1]
+        prices = np.where(known | (nxt > run_end), prices, prices[np.minimum(nxt, len(pos) - 1)])
+
+        waiting = np.isnan(prices)
+        self._pending = (dates[waiting], codes[waiting], prices[waiting])
+        # An all-waiting item had no last price, so writing NaN back is a no-op
+        self._last_price[pos[is_last]] = prices[is_last]
+
+        clean = prices > 0
+        dates, prices, pos = dates[clean], prices[clean], pos[clean]
+        if not len(pos):
+            return 0
+
+        # Per-item batch statistics (two-pass, so the batch M2 is exact), merged into
+        # the running ones with Chan et al.'s parallel Welford update
+        n_items = len(self._items)
+        n_b = np.bincount(pos, minlength=n_items)
+        touched = n_b > 0
+        mean_b = np.bincount(pos, weights=prices, minlength=n_items)[touched] / n_b[touched]
+        deviations = prices - np.repeat(mean_b, n_b[touched])
+        m2_b = np.bincount(pos, weights=deviations ** 2, minlength=n_items)[touched]
+        n_b = n_b[touched]
+
+        n_a = self._n[touched]
+        n = n_a + n_b
+        delta = mean_b - self._mean[touched]
+        self._mean[touched] += delta * n_b / n
+        self._m2[touched] += m2_b + delta ** 2 * n_a * n_b / n
+        self._n[touched] = n
+
+        days, day_idx = np.unique(dates.astype(np.int64), return_inverse=True)
+        day_sums = np.bincount(day_idx, weights=prices)
+        day_counts = np.bincount(day_idx)
+        for day, total, count in zip(days.tolist(), day_sums.tolist(), day_counts.tolist()):
+            self._day_sum[day] = self._day_sum.get(day, 0.0) + total
+            self._day_count[day] = self._day_count.get(day, 0) + count
+
+        # Write only each item's last `window` new prices so ring slots never collide
+        starts = np.r_[0, np.cumsum(n_b)[:-1]]
+        rank = np.arange(len(pos)) - np.repeat(starts, n_b)
+        remaining = np.repeat(n_b, n_b) - rank
+        recent = remaining <= self.window
+        slots = (self._window_filled[pos] + rank) % self.window
+        self._window_prices[pos[recent], slots[recent]] = prices[recent]
+        self._window_filled[touched] += n_b
+        return len(pos)
+
+    def _prefix_digest(self, path, offset):
+        """SHA-256 over the first `offset` bytes, i.e. everything already folded in."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            remaining = offset
+            while remaining:
+                block = f.read(min(1 << 20, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+        return digest
+
+    def refresh(self, path=ANNEX3_PATH):
+        """
+        Parses and folds in only the rows appended to annex3.csv since the last refresh.
+        The already consumed prefix is re-hashed to tell an append from an edit: any change
+        to earlier bytes (e.g. a corrected price) rebuilds the state from scratch.
+        Returns the number of new rows.
+        """
+        size = os.path.getsize(path)
+        digest = None
+        if self._source_offset and size >= self._source_offset:
+            digest = self._prefix_digest(path, self._source_offset)
+        appended = digest is not None and digest.hexdigest() == self._source_fingerprint
+
+        if not appended:
+            self.reset()
+            read_prices = annex_data.ANNEXES["annex3"][1]
+            data = annex_data.load_prices(cleaned=False) if path == ANNEX3_PATH else read_prices(path)
+            self.update(data)
+            self._source_offset = size
+            self._source_fingerprint = self._prefix_digest(path, size).hexdigest()
+            return len(data)
+
+        with open(path, "rb") as f:
+            header = f.readline().decode("utf-8-sig").strip().split(",")
+            f.seek(self._source_offset)
+            tail = f.read()
+        complete = tail[:tail.rfind(b"\n") + 1]  # leave a partially written last line for next time
+        if not complete.strip():
+            return 0
+
+        new_rows = pd.read_csv(io.BytesIO(complete), header=None, names=header,
+                               dtype={ITEM: "int64", PRICE: "float32"}, parse_dates=[DATE], date_format="%Y-%m-%d")
+        self.update(new_rows)
+        self._source_offset += len(complete)
+        digest.update(complete)
+        self._source_fingerprint = digest.hexdigest()
+        return len(new_rows)
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    def _observed(self):
+        return self._n > 0
+
+    def item_stats(self):
+        """Per-item count, mean and sample standard deviation (ddof=1, as pandas)."""
+        seen = self._observed()
+        n = self._n[seen]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.where(n > 1, np.sqrt(self._m2[seen] / (n - 1)), np.nan)
+        return pd.DataFrame({
+            ITEM: self._items[seen].to_numpy(),
+            "Count": n,
+            "Average Price": self._mean[seen],
+            "Price Volatility (StdDev)": std,
+        })
+
+    def volatility(self):
+        """Same columns and ordering as the annex3 notebook's volatility matrix."""
+        stats = self.item_stats()
+        return (
+            stats[[ITEM, "Price Volatility (StdDev)", "Average Price"]]
+            .sort_values("Price Volatility (StdDev)", ascending=False)
+            .reset_index(drop=True)
+        )
+
+    def daily_average_price(self):
+        days = np.fromiter(self._day_sum, dtype=np.int64, count=len(self._day_sum))
+        sums = np.fromiter(self._day_sum.values(), dtype=np.float64, count=len(days))
+        counts = np.fromiter(self._day_count.values(), dtype=np.float64, count=len(days))
+        order = np.argsort(days)
+        return pd.DataFrame({
+            DATE: days[order].astype("datetime64[ns]"),
+            PRICE: sums[order] / counts[order],
+        })
+
+    def rolling_stats(self):
+        """Per-item mean and sample std over each item's last `window` observations."""
+        seen = self._observed()
+        window = self._window_prices[seen]
+        observations = np.minimum(self._window_filled[seen], self.window)
+        with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # single-observation items
+            mean = np.nanmean(window, axis=1)
+            std = np.where(observations > 1, np.nanstd(window, axis=1, ddof=1), np.nan)
+        return pd.DataFrame({
+            ITEM: self._items[seen].to_numpy(),
+            f"Rolling Mean ({self.window})": mean,
+            f"Rolling StdDev ({self.window})": std,
+            "Observations": observations,
+        })
+
+    def effective_cost_by_category(self):
+        """
+        Loss-adjusted cost per category: a kilo sold costs price / (1 - loss rate),
+        since the lost share of each purchased kilo is paid for but never sold.
+        Prices are weighted by each item's observation count.
+        """
+        stats = self.item_stats()
+        codes = stats[ITEM]
+        stats["Category Name"] = self._item_categories.reindex(codes).fillna("Unknown").to_numpy()
+        stats["Loss Rate (%)"] = self._item_loss.reindex(codes).fillna(0.0).to_numpy()
+        # A 100% loss rate would make the cost unbounded
+        kept = 1.0 - stats["Loss Rate (%)"].clip(upper=99.9) / 100.0
+        stats["Effective Cost"] = stats["Average Price"] / kept
+        stats["_weighted_price"] = stats["Average Price"] * stats["Count"]
+        stats["_weighted_cost"] = stats["Effective Cost"] * stats["Count"]
+
+        grouped = stats.groupby("Category Name").agg(
+            Items=(ITEM, "count"),
+            Observations=("Count", "sum"),
+            _weighted_price=("_weighted_price", "sum"),
+            _weighted_cost=("_weighted_cost", "sum"),
+            **{"Average Loss Rate (%)": ("Loss Rate (%)", "mean")},
+        )
+        grouped["Average Price"] = grouped["_weighted_price"] / grouped["Observations"]
+        grouped["Effective Cost"] = grouped["_weighted_cost"] / grouped["Observations"]
+        return (
+            grouped.drop(columns=["_weighted_price", "_weighted_cost"])
+            .sort_values("Effective Cost", ascending=False)
+            .reset_index()
+        )
+
+
+if __name__ == "__main__":
+    engine = PriceAnalytics.from_annex()
+    new_rows = engine.refresh()
+    engine.save()
+    print(f"Folded in {new_rows} new rows ({engine.rows_seen} total).")
+    print(engine.effective_cost_by_category().to_string(index=False))
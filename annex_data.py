@@ -0,0 +1,267 @@
+"""
+Shared data access for the annex datasets (annex1-4).
+
+Each CSV is parsed and cleaned once (the same cleaning the analysis notebooks
+do), with compact dtypes: categorical item/category codes, float32 prices and
+quantities, and native datetime columns. The typed and cleaned tables are
+cached as uncompressed Feather files in .annex_cache/, so a load reads typed
+columns straight from disk instead of parsing and cleaning the CSV again. The
+returned DataFrames are regular, writable pandas frames that own their data
+(copied out of the memory-mapped file). The cache is rebuilt when the source
+file's SHA-256 changes; rebuilt files replace the old ones atomically, so frames
+and memory maps from earlier loads are never rewritten underneath.
+
+Loading never writes the tracked *_cleaned.csv files; export_cleaned() (or
+running this module) refreshes them explicitly.
+
+Usage (from the repo root or a notebook):
+    from annex_data import load_prices, load_items, load_loss_rates, load_sales
+    prices = load_prices()               # cleaned annex3
+    raw = load_annex("annex3", cleaned=False)
+    export_cleaned("annex3")             # writes annex3_cleaned.csv
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(ROOT_DIR, ".annex_cache")
+
+# Bump when parsing/cleaning changes so existing caches are rebuilt
+SCHEMA_VERSION = 1
+
+
+def _read_items(path):
+    return pd.read_csv(
+        path,
+        dtype={"Item Code": "int64", "Item Name": "string", "Category Code": "int64", "Category Name": "string"},
+    ).astype({"Item Code": "category", "Category Code": "category"})
+
+
+def _clean_items(df):
+    df = df.drop_duplicates(subset="Item Code", keep="first")
+    df["Item Name"] = df["Item Name"].str.strip()
+    df["Category Name"] = df["Category Name"].str.strip().astype("category")
+    return df
+
+
+def _read_sales(path):
+    df = pd.read_csv(
+        path,
+        dtype={
+            "Date": "string",
+            "Time": "string",
+            "Item Code": "int64",
+            "Quantity Sold (kilo)": "float32",
+            "Unit Selling Price (RMB/kg)": "float32",
+            "Sale or Return": "category",
+            "Discount (Yes/No)": "category",
+        },
+    )
+    # Mixed formats: some timestamps lack microseconds
+    df["Datetime"] = pd.to_datetime(df["Date"] + " " + df["Time"], format="mixed")
+    df["Date"] = df["Datetime"].dt.normalize()
+    df = df.drop(columns=["Time"])
+    df["Item Code"] = df["Item Code"].astype("category")
+    df["Revenue"] = (df["Quantity Sold (kilo)"] * df["Unit Selling Price (RMB/kg)"]).astype("float32")
+    df["Hour"] = df["Datetime"].dt.hour.astype("int8")
+    df["DayOfWeek"] = df["Datetime"].dt.day_name().astype("category")
+    return df
+
+
+def _clean_sales(df):
+    sales = df[df["Sale or Return"] == "sale"]
+    valid = (sales["Quantity Sold (kilo)"] > 0) & (sales["Unit Selling Price (RMB/kg)"] >= 0)
+    return sales[valid]
+
+
+def _read_prices(path):
+    df = pd.read_csv(
+        path,
+        dtype={"Item Code": "int64", "Wholesale Price (RMB/kg)": "float32"},
+        parse_dates=["Date"],
+        date_format="%Y-%m-%d",
+    )
+    df["Item Code"] = df["Item Code"].astype("category")
+    return df
+
+
+def _clean_prices(df):
+    df = df.sort_values(by=["Item Code", "Date"])
+    price = "Wholesale Price (RMB/kg)"
+    if df[price].isna().any():
+        # Assume price stability: carry each item's price forward, then back
+        grouped = df.groupby("Item Code", observed=True)[price]
+        df[price] = grouped.ffill()
+        df[price] = df.groupby("Item Code", observed=True)[price].bfill()
+    return df[df[price] > 0]
+
+
+def _read_loss_rates(path):
+    df = pd.read_csv(
+        path,
+        encoding="utf-8-sig",
+        dtype={"Item Code": "int64", "Item Name": "string", "Loss Rate (%)": "float32"},
+    )
+    return df.astype({"Item Code": "category"})
+
+
+def _clean_loss_rates(df):
+    df["Loss Rate (%)"] = df["Loss Rate (%)"].clip(0, 100)
+    if df.duplicated(subset=["Item Code"]).any():
+        df = (
+            df.groupby(["Item Code", "Item Name"], observed=True)["Loss Rate (%)"]
+            .mean()
+            .astype("float32")
+            .reset_index()
+        )
+    return df
+
+
+ANNEXES = {
+    "annex1": ("annex1.csv", _read_items, _clean_items),
+    "annex2": ("annex2.csv", _read_sales, _clean_sales),
+    "annex3": ("annex3.csv", _read_prices, _clean_prices),
+    "annex4": ("annex4.csv", _read_loss_rates, _clean_loss_rates),
+}
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_paths(name):
+    return (
+        os.path.join(CACHE_DIR, f"{name}.feather"),
+        os.path.join(CACHE_DIR, f"{name}_cleaned.feather"),
+        os.path.join(CACHE_DIR, f"{name}.meta.json"),
+    )
+
+
+def _cache_is_fresh(source, meta_path):
+    """
+    Compares the source against the cache metadata. Size and mtime are checked first;
+    the hash is only recomputed when they differ (e.g. the file was touched or appended).
+    """
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("schema_version") != SCHEMA_VERSION:
+        return False
+
+    stat = os.stat(source)
+    if meta.get("size") == stat.st_size and meta.get("mtime") == stat.st_mtime:
+        return True
+    if meta.get("sha256") != _file_sha256(source):
+        return False
+
+    # Same content, new mtime: refresh the fast-path fields
+    meta["mtime"] = stat.st_mtime
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return True
+
+
+def build_cache(name, force=False):
+    """Parses, cleans and caches one annex if its source changed. Returns True if rebuilt."""
+    from pyarrow import feather
+
+    filename, read, clean = ANNEXES[name]
+    source = os.path.join(ROOT_DIR, filename)
+    typed_path, cleaned_path, meta_path = _cache_paths(name)
+    if not force and _cache_is_fresh(source, meta_path):
+        return False
+
+    logging.info(f"Building columnar cache for {filename}...")
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    typed = read(source)
+    cleaned = clean(typed.copy())
+
+    # Uncompressed so loads skip decompression and can memory-map the file. Written
+    # to a temp path and renamed, so a rebuild gets a new inode instead of changing
+    # (or truncating) a file another load may still have mapped.
+    for df, path in ((typed, typed_path), (cleaned, cleaned_path)):
+        tmp_path = path + ".tmp"
+        feather.write_feather(df.reset_index(drop=True), tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+
+    stat = os.stat(source)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "schema_version": SCHEMA_VERSION,
+            "sha256": _file_sha256(source),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "rows": len(typed),
+            "cleaned_rows": len(cleaned),
+        }, f)
+    return True
+
+
+def load_annex(name, cleaned=True, columns=None):
+    """
+    Returns an annex as a DataFrame with compact dtypes, from the columnar cache.
+    Falls back to parsing the CSV directly if pyarrow is not installed.
+    """
+    if name not in ANNEXES:
+        raise ValueError(f"Unknown annex '{name}'. Expected one of {sorted(ANNEXES)}.")
+
+    try:
+        from pyarrow import feather
+    except ImportError:
+        logging.warning("pyarrow is not installed; parsing the annex CSV without the columnar cache.")
+        filename, read, clean = ANNEXES[name]
+        df = read(os.path.join(ROOT_DIR, filename))
+        df = clean(df) if cleaned else df
+        return df[columns] if columns else df
+
+    build_cache(name)
+    typed_path, cleaned_path, _ = _cache_paths(name)
+    table = feather.read_table(cleaned_path if cleaned else typed_path, columns=columns, memory_map=True)
+    # to_pandas() can hand back zero-copy, read-only views of the mapped file (e.g.
+    # categorical codes); copy so callers get writable frames independent of the cache
+    return table.to_pandas().copy(deep=True)
+
+
+def export_cleaned(name):
+    """Writes the cleaned annex to <annex>_cleaned.csv in the repo root and returns its path."""
+    filename = ANNEXES[name][0]
+    path = os.path.join(ROOT_DIR, filename.replace(".csv", "_cleaned.csv"))
+    load_annex(name).to_csv(path, index=False)
+    return path
+
+
+def load_items(cleaned=True, columns=None):
+    return load_annex("annex1", cleaned, columns)
+
+
+def load_sales(cleaned=True, columns=None):
+    return load_annex("annex2", cleaned, columns)
+
+
+def load_prices(cleaned=True, columns=None):
+    return load_annex("annex3", cleaned, columns)
+
+
+def load_loss_rates(cleaned=True, columns=None):
+    return load_annex("annex4", cleaned, columns)
+
+
+if __name__ == "__main__":
+    # Build (or refresh) every cache whose source CSV is present, and export the cleaned CSVs
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+    for annex, (filename, _, _) in ANNEXES.items():
+        if os.path.exists(os.path.join(ROOT_DIR, filename)):
+            rebuilt = build_cache(annex)
+            df = load_annex(annex)
+            print(f"{annex}: {len(df)} rows, {df.memory_usage(deep=True).sum() / 1e6:.2f} MB"
+                  f" ({'rebuilt' if rebuilt else 'cached'}), exported {os.path.basename(export_cleaned(annex))}")
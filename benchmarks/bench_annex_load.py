@@ -0,0 +1,47 @@
+"""
+Compares loading annex3 the way the notebooks used to (default read_csv +
+to_datetime + cleaning) against annex_data's columnar (Feather) cache.
+
+Usage:
+    python benchmarks/bench_annex_load.py
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+import annex_data
+
+
+def notebook_load():
+    df = pd.read_csv(os.path.join(PROJECT_ROOT, 'annex3.csv'))
+    df['Date'] = pd.to_datetime(df['Date'])
+    df = df.sort_values(by=['Item Code', 'Date'])
+    df['Wholesale Price (RMB/kg)'] = df.groupby('Item Code')['Wholesale Price (RMB/kg)'].ffill().bfill()
+    return df[df['Wholesale Price (RMB/kg)'] > 0]
+
+
+def timed(fn, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        df = fn()
+        best = min(best, time.perf_counter() - start)
+    return df, best
+
+
+def main(repeats=5):
+    annex_data.build_cache("annex3")
+    for label, fn in [("notebook read_csv", notebook_load), ("annex_data cache", annex_data.load_prices)]:
+        df, seconds = timed(fn, repeats)
+        memory_mb = df.memory_usage(deep=True).sum() / 1e6
+        print(f"{label:<20} {seconds * 1000:9.1f} ms  {memory_mb:7.2f} MB  {len(df)} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Parity check and throughput benchmark for the embedding backends.
+
+Encodes the captured article texts with the reference torch backend and each
+candidate backend, then reports cosine agreement with torch, batch throughput
+and single-query latency (what RAGEngine.retrieve pays per chat message).
+
+Usage:
+    python benchmarks/bench_embeddings.py
+    python benchmarks/bench_embeddings.py --backends onnx-int8 --min-cosine 0.98
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils_embeddings import load_backend
+from bench_utils import RAW_PATH, SAMPLE_QUERIES, load_json, percentile
+
+
+def measure(backend, texts, batch_size, repeats):
+    backend.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        vectors = backend.encode(texts, batch_size=batch_size)
+    batch_throughput = len(texts) * repeats / (time.perf_counter() - start)
+
+    latencies = []
+    for query in SAMPLE_QUERIES * repeats:
+        t0 = time.perf_counter()
+        backend.encode([query])
+        latencies.append(time.perf_counter() - t0)
+    latencies.sort()
+    return np.asarray(vectors, dtype=np.float32), batch_throughput, latencies
+
+
+def cosine_rows(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Embedding backend parity + throughput benchmark")
+    parser.add_argument("--backends", default="onnx,onnx-int8", help="Backends to compare against torch")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--min-cosine", type=float, default=0.98,
+                        help="Fail if any text's cosine agreement with torch falls below this")
+    args = parser.parse_args(argv)
+
+    articles = load_json(RAW_PATH)
+    texts = [a.get('full_text') or a.get('summary_rss') or a.get('title', '') for a in articles]
+
+    results = {}
+    reference = None
+    failed = False
+    for name in ["torch"] + [b.strip() for b in args.backends.split(",") if b.strip()]:
+        print(f"Loading {name} backend...")
+        t0 = time.perf_counter()
+        backend = load_backend(name)
+        load_s = time.perf_counter() - t0
+
+        vectors, throughput, latencies = measure(backend, texts, args.batch_size, args.repeats)
+        entry = {
+            "load_s": round(load_s, 3),
+            "texts_per_s": round(throughput, 2),
+            "query_p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "query_p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        }
+        if reference is None:
+            reference = vectors
+        else:
+            cos = cosine_rows(reference, vectors)
+            entry["cosine_mean"] = round(float(cos.mean()), 5)
+            entry["cosine_min"] = round(float(cos.min()), 5)
+            entry["speedup_vs_torch"] = round(throughput / results["torch"]["texts_per_s"], 2)
+            if cos.min() < args.min_cosine:
+                failed = True
+        results[name] = entry
+        del backend
+
+    print(json.dumps(results, indent=4))
+    if failed:
+        print(f"PARITY FAILED: a backend fell below cosine {args.min_cosine} against torch.")
+        return 1
+    print("Parity OK.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
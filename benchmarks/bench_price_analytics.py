@@ -0,0 +1,105 @@
+"""
+Compares refreshing the annex3 analytics the way annex3_analysis.ipynb does
+(clean + groupby over the whole history every time) against PriceAnalytics,
+which folds in only the newly appended rows.
+
+The first part of the history is loaded up front; the remaining days are then
+replayed one at a time, as if annex3.csv grew by one day between refreshes.
+Results are checked against the full recompute at the end.
+
+Usage:
+    python benchmarks/bench_price_analytics.py --days 30
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+import annex_data
+from annex_analytics import PriceAnalytics, DATE, ITEM, PRICE
+
+
+def notebook_refresh(raw):
+    df = raw.sort_values(by=[ITEM, DATE])
+    df[PRICE] = df.groupby(ITEM, observed=True)[PRICE].ffill()
+    df[PRICE] = df.groupby(ITEM, observed=True)[PRICE].bfill()
+    df = df[df[PRICE] > 0]
+    daily = df.groupby(DATE)[PRICE].mean().reset_index()
+    volatility = df.groupby(ITEM, observed=True)[PRICE].agg(['std', 'mean']).reset_index()
+    volatility.columns = [ITEM, 'Price Volatility (StdDev)', 'Average Price']
+    return daily, volatility.sort_values('Price Volatility (StdDev)', ascending=False)
+
+
+def check_parity(engine, raw, rtol=1e-4):
+    daily, volatility = notebook_refresh(raw)
+    cleaned = annex_data.load_prices()
+
+    ours = engine.daily_average_price()
+    np.testing.assert_allclose(ours[PRICE].to_numpy(), daily[PRICE].to_numpy(dtype=np.float64), rtol=rtol)
+
+    expected = volatility.assign(**{ITEM: volatility[ITEM].astype('int64')}).set_index(ITEM).sort_index()
+    actual = engine.volatility().set_index(ITEM).sort_index()
+    assert list(actual.index) == list(expected.index), "item sets differ"
+    for column in ['Average Price', 'Price Volatility (StdDev)']:
+        np.testing.assert_allclose(actual[column].to_numpy(), expected[column].to_numpy(dtype=np.float64),
+                                   rtol=rtol, equal_nan=True)
+
+    tail = cleaned.groupby(ITEM, observed=True).tail(engine.window)
+    rolling = tail.groupby(ITEM, observed=True)[PRICE].agg(['mean', 'std'])
+    rolling.index = rolling.index.astype('int64')
+    actual = engine.rolling_stats().set_index(ITEM).sort_index()
+    np.testing.assert_allclose(actual[f"Rolling Mean ({engine.window})"].to_numpy(),
+                               rolling['mean'].sort_index().to_numpy(dtype=np.float64), rtol=rtol)
+    np.testing.assert_allclose(actual[f"Rolling StdDev ({engine.window})"].to_numpy(),
+                               rolling['std'].sort_index().to_numpy(dtype=np.float64), rtol=rtol, equal_nan=True)
+
+
+def main(days=30):
+    raw = annex_data.load_prices(cleaned=False)
+    dates = np.sort(raw[DATE].unique())
+    replay = dates[-days:]
+    history = raw[raw[DATE] < replay[0]]
+
+    engine = PriceAnalytics(annex_data.load_items(), annex_data.load_loss_rates())
+    engine.update(history)
+
+    full_seconds, incremental_seconds = [], []
+    seen = history
+    for day in replay:
+        new_rows = raw[raw[DATE] == day]
+        seen = pd.concat([seen, new_rows], ignore_index=True)
+
+        start = time.perf_counter()
+        notebook_refresh(seen)
+        full_seconds.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        engine.update(new_rows)
+        engine.daily_average_price()
+        engine.volatility()
+        incremental_seconds.append(time.perf_counter() - start)
+
+    check_parity(engine, raw)
+
+    full_ms = np.median(full_seconds) * 1000
+    incremental_ms = np.median(incremental_seconds) * 1000
+    print(f"Replayed {len(replay)} days ({len(raw) - len(history)} rows) on top of {len(history)} rows")
+    print(f"{'notebook full recompute':<26} {full_ms:9.2f} ms/day (median)")
+    print(f"{'PriceAnalytics.update':<26} {incremental_ms:9.2f} ms/day (median)  {full_ms / incremental_ms:5.1f}x")
+    print("Parity with the notebook results: OK")
+    print()
+    print(engine.effective_cost_by_category().to_string(index=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=30, help="Number of trailing days to replay one at a time")
+    args = parser.parse_args()
+    main(args.days)
@@ -0,0 +1,44 @@
+"""Helpers shared by the benchmark scripts."""
+
+import json
+import os
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+RAW_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'latest_articles.json')
+PROCESSED_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'processed_articles.json')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+SAMPLE_QUERIES = [
+    "latest sports news",
+    "What happened in tech this week?",
+    "Any news about cars and new launches?",
+    "Summarize political news from India",
+    "What is the latest on 2026-02-05?",
+]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies, wall_seconds, errors=0):
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "errors": errors,
+        "wall_s": round(wall_seconds, 4),
+        "throughput_per_s": round(len(values) / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+    }
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
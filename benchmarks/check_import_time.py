@@ -0,0 +1,71 @@
+"""
+Import-time budget check for the pipeline modules.
+
+Each module is imported in a fresh interpreter; the check fails if an import
+exceeds the budget or drags in a heavy dependency (torch, groq, pandas, ...)
+that should only be loaded on first use.
+
+Usage:
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --budget 0.5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+MODULES = ["config", "utils_embeddings", "store_mongo", "ingest_rss", "process_llm", "rag_engine"]
+HEAVY_MODULES = ["torch", "sentence_transformers", "transformers", "onnxruntime",
+                 "groq", "pandas", "feedparser", "bs4", "requests"]
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module):
+    code = PROBE.format(src=SRC_DIR, module=module, heavy=HEAVY_MODULES)
+    # Throwaway cwd: some modules create files on import (e.g. ingest_rss's ingestion.log)
+    with tempfile.TemporaryDirectory() as cwd:
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=cwd)
+    if out.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time budget check")
+    parser.add_argument("--budget", type=float, default=1.0, help="Max seconds per module import")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for module in MODULES:
+        result = measure(module)
+        problems = []
+        if result["seconds"] > args.budget:
+            problems.append(f"over budget ({args.budget:.2f}s)")
+        if result["heavy"]:
+            problems.append(f"eagerly imports {', '.join(result['heavy'])}")
+        print(f"{module:<18} {result['seconds'] * 1000:8.1f} ms  {'; '.join(problems) or 'ok'}")
+        if problems:
+            failures.append(module)
+
+    if failures:
+        print(f"FAILED: {', '.join(failures)}")
+        return 1
+    print("All imports within budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,590 @@
+"""
+Local stand-ins used by the benchmark suite so the pipeline can be exercised
+without live RSS feeds, a Groq API key or a running MongoDB.
+
+- FakeFeedServer: serves captured articles as RSS feeds + article HTML pages.
+- MockGroq: mimics `client.chat.completions.create` with latency and 429s.
+- FakeMongoClient: in-memory subset of the pymongo API used by MongoStore.
+"""
+
+import copy
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+
+# ---------------------------------------------------------------------------
+# RSS / HTTP
+# ---------------------------------------------------------------------------
+
+class FakeFeedServer:
+    """
+    Serves `articles` (in the data/raw/latest_articles.json shape) on localhost.
+    Each original `source_url` becomes /feed/<n>, and each article link becomes
+    /article/<quoted link> whose body wraps `full_text` in an <article> tag.
+    """
+
+    def __init__(self, articles, latency=0.0, port=0):
+        self.latency = latency
+        self.feeds = defaultdict(list)
+        self.pages = {}
+        for article in articles:
+            self.feeds[article.get('category_group', 'Misc')].append(article)
+            self.pages[article['link']] = article.get('full_text') or article.get('summary_rss', '')
+
+        self._feed_paths = {}
+        for category, items in self.feeds.items():
+            by_source = defaultdict(list)
+            for item in items:
+                by_source[item['source_url']].append(item)
+            for source_items in by_source.values():
+                self._feed_paths[f"/feed/{len(self._feed_paths)}"] = (category, source_items)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rss_feeds(self):
+        """Returns a RSS_FEEDS-shaped dict pointing at this server."""
+        feeds = defaultdict(list)
+        for path, (category, _) in self._feed_paths.items():
+            feeds[category].append(self.base_url + path)
+        return dict(feeds)
+
+    def _render_feed(self, items):
+        entries = []
+        for item in items:
+            link = f"{self.base_url}/article/{quote(item['link'], safe='')}"
+            entries.append(
+                "<item>"
+                f"<title>{escape(item.get('title', ''))}</title>"
+                f"<link>{escape(link)}</link>"
+                f"<pubDate>{escape(item.get('published', ''))}</pubDate>"
+                f"<description>{escape(item.get('summary_rss', ''))}</description>"
+                "</item>"
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<rss version="2.0"><channel><title>Fake Feed</title>'
+            + "".join(entries) +
+            "</channel></rss>"
+        )
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                if self.path in server._feed_paths:
+                    body = server._render_feed(server._feed_paths[self.path][1])
+                    content_type = "application/rss+xml"
+                elif self.path.startswith("/article/"):
+                    text = server.pages.get(unquote(self.path[len("/article/"):]))
+                    if text is None:
+                        self.send_error(404)
+                        return
+                    body = f"<html><body><article><p>{escape(text)}</p></article></body></html>"
+                    content_type = "text/html"
+                else:
+                    self.send_error(404)
+                    return
+                payload = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ---------------------------------------------------------------------------
+# Groq
+# ---------------------------------------------------------------------------
+
+class MockRateLimitError(Exception):
+    status_code = 429
+
+
+class MockGroq:
+    """
+    Drop-in for `groq.Groq` covering `chat.completions.create`.
+    `latency` seconds (+/- `jitter`) are slept per call, and a `rate_limit_rate`
+    fraction of calls raise MockRateLimitError like an HTTP 429 would.
+    """
+
+    SENTIMENTS = ["Positive", "Negative", "Neutral"]
+
+    def __init__(self, latency=0.2, jitter=0.0, rate_limit_rate=0.0, categories=None, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_rate = rate_limit_rate
+        self.categories = categories or ["Political", "Author Opinion", "Threatful", "Entertainment"]
+        self.calls = 0
+        self.rate_limited = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, messages, model=None, response_format=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            limited = self._rng.random() < self.rate_limit_rate
+            if limited:
+                self.rate_limited += 1
+        time.sleep(delay)
+        if limited:
+            raise MockRateLimitError("Error code: 429 - Rate limit reached (mock)")
+
+        prompt = messages[-1]["content"]
+        digest = int(hashlib.md5(prompt.encode("utf-8")).hexdigest(), 16)
+        if response_format and response_format.get("type") == "json_object":
+            content = json.dumps({
+                "summary": "Synthetic summary generated by the benchmark mock.",
+                "category": self.categories[digest % len(self.categories)],
+                "sentiment": self.SENTIMENTS[digest % len(self.SENTIMENTS)],
+            })
+        else:
+            content = f"Mock answer drawing on {len(prompt)} characters of context."
+        message = SimpleNamespace(content=content, role="assistant")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+# ---------------------------------------------------------------------------
+# Embeddings
+# ---------------------------------------------------------------------------
+
+def hash_embedding(text, dim=384):
+    """Deterministic unit vector for `text`; stands in for the model when it is not available offline."""
+    seed = int(hashlib.md5((text or "").encode("utf-8")).hexdigest()[:8], 16)
+    vec = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return (vec / np.linalg.norm(vec)).tolist()
+
+
+def hash_embeddings(texts, batch_size=32):
+    return [hash_embedding(text) for text in texts]
+
+
+# ---------------------------------------------------------------------------
+# MongoDB
+# ---------------------------------------------------------------------------
+
+_MISSING = object()
+
+
+def _get_field(doc, key):
+    value = doc
+    for part in key.split("."):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return _MISSING
+    return value
+
+
+def _compare(value, op, operand):
+    if op == "$exists":
+        return (value is not _MISSING) == bool(operand)
+    if op == "$ne":
+        return value is _MISSING or value != operand
+    if op == "$in":
+        return value is not _MISSING and value in operand
+    if op == "$nin":
+        return value is _MISSING or value not in operand
+    if op == "$size":
+        return isinstance(value, list) and len(value) == operand
+    if value is _MISSING or value is None:
+        return False
+    try:
+        if op == "$gt":
+            return value > operand
+        if op == "$gte":
+            return value >= operand
+        if op == "$lt":
+            return value < operand
+        if op == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+    raise NotImplementedError(f"FakeCollection does not support operator {op}")
+
+
+def _matches(doc, query):
+    for key, condition in (query or {}).items():
+        if key == "$or":
+            if not any(_matches(doc, sub) for sub in condition):
+                return False
+            continue
+        if key == "$and":
+            if not all(_matches(doc, sub) for sub in condition):
+                return False
+            continue
+
+        value = _get_field(doc, key)
+        if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            if "$regex" in condition:
+                flags = re.IGNORECASE if "i" in condition.get("$options", "") else 0
+                if not (isinstance(value, str) and re.search(condition["$regex"], value, flags)):
+                    return False
+            for op, operand in condition.items():
+                if op in ("$regex", "$options"):
+                    continue
+                if not _compare(value, op, operand):
+                    return False
+        elif value is _MISSING:
+            if condition is not None:
+                return False
+        elif value != condition and not (isinstance(value, list) and condition in value):
+            return False
+    return True
+
+
+def _hashable(value):
+    return not isinstance(value, (list, dict, set))
+
+
+def _index_keys(value):
+    # Multikey like MongoDB: a list is indexed under each of its elements
+    values = value if isinstance(value, list) else [value]
+    return [v for v in values if _hashable(v)]
+
+
+def _sort_key(value):
+    # Missing/None sort first, then mixed types grouped by type name.
+    if value is _MISSING or value is None:
+        return (0, "", 0)
+    return (1, type(value).__name__, value)
+
+
+class FakeCursor:
+    def __init__(self, docs, projection=None):
+        self._docs = docs
+        self._projection = projection
+        self._limit = 0
+        self._skip = 0
+
+    def sort(self, key_or_list, direction=1):
+        keys = key_or_list if isinstance(key_or_list, list) else [(key_or_list, direction)]
+        for key, dirn in reversed(keys):
+            self._docs.sort(key=lambda d: _sort_key(_get_field(d, key)), reverse=dirn < 0)
+        return self
+
+    def skip(self, n):
+        self._skip = n
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def _project(self, doc):
+        if not self._projection:
+            return dict(doc)
+        include = {k for k, v in self._projection.items() if v}
+        exclude = {k for k, v in self._projection.items() if not v}
+        if include:
+            out = {k: doc[k] for k in include if k in doc}
+            if "_id" not in exclude and "_id" in doc:
+                out["_id"] = doc["_id"]
+            return out
+        return {k: v for k, v in doc.items() if k not in exclude}
+
+    def __iter__(self):
+        docs = self._docs[self._skip:]
+        if self._limit:
+            docs = docs[:self._limit]
+        return (self._project(d) for d in docs)
+
+
+class FakeCollection:
+    """Thread-safe, in-memory collection implementing what this repo calls on pymongo."""
+
+    def __init__(self, name):
+        self.name = name
+        self._docs = {}
+        self._unique = {}
+        self._secondary = {}
+        self._indexes = []
+        self._next_id = 0
+        self._lock = threading.RLock()
+
+    def create_index(self, keys, unique=False, **kwargs):
+        with self._lock:
+            self._indexes.append((keys, unique, kwargs))
+            if unique and isinstance(keys, str):
+                self._unique[keys] = {d[keys]: _id for _id, d in self._docs.items() if keys in d}
+            else:
+                # Non-unique or compound index: serve equality on its leading field
+                field = keys if isinstance(keys, str) else keys[0][0]
+                if field != "_id" and field not in self._unique and field not in self._secondary:
+                    index = self._secondary[field] = {}
+                    for _id, d in self._docs.items():
+                        for key in _index_keys(d.get(field)) if field in d else ():
+                            index.setdefault(key, {})[_id] = None
+        return keys if isinstance(keys, str) else "_".join(f"{k}_{v}" for k, v in keys)
+
+    def _new_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def _check_unique(self, doc, own_id=None):
+        for field, index in self._unique.items():
+            if field in doc and index.get(doc[field], own_id) != own_id:
+                raise ValueError(f"E11000 duplicate key error: {field}={doc[field]!r}")
+
+    def _index(self, doc):
+        for field, index in self._unique.items():
+            if field in doc:
+                index[doc[field]] = doc["_id"]
+        for field, index in self._secondary.items():
+            for key in _index_keys(doc[field]) if field in doc else ():
+                index.setdefault(key, {})[doc["_id"]] = None
+
+    def _unindex(self, doc):
+        for field, index in self._unique.items():
+            if field in doc:
+                index.pop(doc[field], None)
+        for field, index in self._secondary.items():
+            for key in _index_keys(doc[field]) if field in doc else ():
+                ids = index.get(key)
+                if ids is not None:
+                    ids.pop(doc["_id"], None)
+                    if not ids:
+                        del index[key]
+
+    def _candidates(self, query):
+        # Equality or $in on _id or an indexed field is served from the index, like a real B-tree lookup.
+        query = query or {}
+        _id = query.get("_id")
+        if _id is not None and not isinstance(_id, dict):
+            return [self._docs[_id]] if _id in self._docs else []
+        if isinstance(_id, dict) and set(_id) == {"$in"}:
+            return [self._docs[i] for i in dict.fromkeys(_id["$in"]) if i in self._docs]
+        for field, index in self._unique.items():
+            ids = self._lookup(query.get(field), lambda v: [index[v]] if v in index else [])
+            if ids is not None:
+                return [self._docs[i] for i in ids]
+        for field, index in self._secondary.items():
+            ids = self._lookup(query.get(field), lambda v: index.get(v, ()))
+            if ids is not None:
+                return [self._docs[i] for i in ids]
+        return list(self._docs.values())
+
+    @staticmethod
+    def _lookup(condition, ids_for):
+        # Returns matching ids for `value` or `{"$in": values}`, or None if the index can't serve it
+        if isinstance(condition, dict):
+            if set(condition) != {"$in"} or not all(_hashable(v) for v in condition["$in"]):
+                return None
+            values = condition["$in"]
+        elif condition is None or not _hashable(condition):
+            return None
+        else:
+            values = [condition]
+        ids = {}
+        for value in values:
+            ids.update(dict.fromkeys(ids_for(value)))
+        return list(ids)
+
+    def insert_one(self, doc):
+        with self._lock:
+            doc = dict(doc)
+            doc.setdefault("_id", self._new_id())
+            self._check_unique(doc)
+            self._docs[doc["_id"]] = doc
+            self._index(doc)
+            return SimpleNamespace(inserted_id=doc["_id"])
+
+    def insert_many(self, docs):
+        return SimpleNamespace(inserted_ids=[self.insert_one(d).inserted_id for d in docs])
+
+    def _apply_update(self, doc, update, inserting=False):
+        for op, fields in update.items():
+            if op == "$set" or (op == "$setOnInsert" and inserting):
+                for key, value in fields.items():
+                    doc[key] = value
+            elif op == "$unset":
+                for key in fields:
+                    doc.pop(key, None)
+            elif op == "$inc":
+                for key, value in fields.items():
+                    doc[key] = doc.get(key, 0) + value
+            elif op == "$setOnInsert":
+                continue
+            else:
+                raise NotImplementedError(f"FakeCollection does not support update {op}")
+
+    def update_one(self, query, update, upsert=False):
+        with self._lock:
+            for doc in self._candidates(query):
+                if _matches(doc, query):
+                    new_doc = dict(doc)
+                    self._apply_update(new_doc, update)
+                    self._check_unique(new_doc, own_id=doc["_id"])
+                    self._unindex(doc)
+                    self._docs[doc["_id"]] = new_doc
+                    self._index(new_doc)
+                    return SimpleNamespace(matched_count=1, modified_count=1, upserted_id=None)
+            if not upsert:
+                return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=None)
+            new_doc = {k: v for k, v in query.items() if not k.startswith("$") and not isinstance(v, dict)}
+            self._apply_update(new_doc, update, inserting=True)
+            inserted = self.insert_one(new_doc)
+            return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=inserted.inserted_id)
+
+    def update_many(self, query, update):
+        with self._lock:
+            ids = [d["_id"] for d in self._candidates(query) if _matches(d, query)]
+            for _id in ids:
+                self.update_one({"_id": _id}, update)
+            return SimpleNamespace(matched_count=len(ids), modified_count=len(ids), upserted_id=None)
+
+    def find_one_and_update(self, query, update, sort=None, return_document=False, upsert=False):
+        with self._lock:
+            docs = FakeCursor([d for d in self._candidates(query) if _matches(d, query)])
+            if sort:
+                docs.sort(sort)
+            docs = list(docs.limit(1))
+            if not docs:
+                if upsert:
+                    self.update_one(query, update, upsert=True)
+                    return self.find_one(query) if return_document else None
+                return None
+            before = docs[0]
+            self.update_one({"_id": before["_id"]}, update)
+            return self.find_one({"_id": before["_id"]}) if return_document else before
+
+    def delete_one(self, query):
+        with self._lock:
+            for doc in self._candidates(query):
+                if _matches(doc, query):
+                    self._unindex(doc)
+                    del self._docs[doc["_id"]]
+                    return SimpleNamespace(deleted_count=1)
+            return SimpleNamespace(deleted_count=0)
+
+    def delete_many(self, query):
+        with self._lock:
+            doomed = [d for d in self._candidates(query) if _matches(d, query)]
+            for doc in doomed:
+                self._unindex(doc)
+                del self._docs[doc["_id"]]
+            return SimpleNamespace(deleted_count=len(doomed))
+
+    def find(self, query=None, projection=None):
+        with self._lock:
+            docs = [d for d in self._candidates(query) if _matches(d, query)]
+        return FakeCursor(docs, projection)
+
+    def find_one(self, query=None, projection=None):
+        for doc in self.find(query, projection).limit(1):
+            return doc
+        return None
+
+    def count_documents(self, query):
+        with self._lock:
+            return sum(1 for d in self._candidates(query) if _matches(d, query))
+
+    def aggregate(self, pipeline):
+        docs = list(self.find({}))
+        for stage in pipeline:
+            if "$match" in stage:
+                docs = [d for d in docs if _matches(d, stage["$match"])]
+            elif "$group" in stage:
+                spec = stage["$group"]
+                key_expr = spec["_id"]
+                groups = {}
+                for doc in docs:
+                    if isinstance(key_expr, dict):
+                        key = {name: _get_field(doc, expr[1:]) for name, expr in key_expr.items()}
+                        key = {name: (None if v is _MISSING else v) for name, v in key.items()}
+                        group_key = tuple(key.items())
+                    else:
+                        key = _get_field(doc, key_expr[1:]) if isinstance(key_expr, str) else key_expr
+                        key = group_key = None if key is _MISSING else key
+                    group = groups.setdefault(group_key, {"_id": key})
+                    for out_field, acc in spec.items():
+                        if out_field == "_id":
+                            continue
+                        op, operand = next(iter(acc.items()))
+                        if op != "$sum":
+                            raise NotImplementedError(f"FakeCollection does not support {op}")
+                        value = operand if not isinstance(operand, str) else _get_field(doc, operand[1:])
+                        group[out_field] = group.get(out_field, 0) + (0 if value is _MISSING else value)
+                docs = list(groups.values())
+            elif "$sort" in stage:
+                docs = list(FakeCursor(docs).sort(list(stage["$sort"].items())))
+            elif "$limit" in stage:
+                docs = docs[:stage["$limit"]]
+            else:
+                raise NotImplementedError(f"FakeCollection does not support stage {stage}")
+        return iter(copy.deepcopy(docs))
+
+    def drop(self):
+        with self._lock:
+            self._docs.clear()
+            for index in self._unique.values():
+                index.clear()
+            self._secondary = {field: {} for field in self._secondary}
+
+
+class FakeDatabase:
+    def __init__(self):
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = FakeCollection(name)
+            return self._collections[name]
+
+    def list_collection_names(self):
+        return list(self._collections)
+
+
+class FakeMongoClient:
+    """Stand-in for `pymongo.MongoClient`; pass it to `MongoStore(client=...)`."""
+
+    def __init__(self, *args, **kwargs):
+        self._dbs = defaultdict(FakeDatabase)
+
+    def __getitem__(self, name):
+        return self._dbs[name]
+
+    def close(self):
+        pass
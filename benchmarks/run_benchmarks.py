@@ -0,0 +1,293 @@
+"""
+Offline benchmark suite for NewsStream AI.
+
+Replays the captured data/raw/latest_articles.json and
+data/processed/processed_articles.json through the real pipeline classes,
+with local stand-ins (see fakes.py) for the RSS feeds, Groq and MongoDB.
+
+Reports throughput and p50/p95/p99 latency for ingest, process, store and
+RAG query (under N concurrent chat users). Store and RAG query are measured
+at each synthetic scale. Every run is saved under benchmarks/results/ and
+compared against the latest previous run with the same configuration (or
+--baseline) to catch regressions.
+
+The fake MongoDB keeps every document in memory, so the default scales stay
+small. Larger scales are opt-in: 100000 needs several GB of RAM, and 1000000
+is beyond what the in-memory fake can hold on a typical machine.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scales 1000 --users 4 --groq-latency 0.05
+    python benchmarks/run_benchmarks.py --scales 1000,10000,100000
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/bench_20260101T000000.json --fail-on-regression
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import ingest_rss
+import process_llm
+import rag_engine
+from ingest_rss import RSSIngester
+from process_llm import ArticleProcessor
+from rag_engine import RAGEngine
+from store_mongo import MongoStore
+from chunking import split_into_passages
+from fakes import FakeFeedServer, FakeMongoClient, MockGroq, hash_embedding, hash_embeddings
+from bench_utils import PROCESSED_PATH, RAW_PATH, RESULTS_DIR, SAMPLE_QUERIES, load_json, summarize
+
+
+def synthetic_articles(base_articles, n):
+    """
+    Yields `n` processed articles cycling over `base_articles` with unique links.
+    Captured articles predate the chunk index, so passages are split from their
+    full text and share the article embedding (scoring cost is the same).
+    """
+    chunk_sets = [
+        [{"chunk_index": j, "text": passage, "embedding": base['embedding']}
+         for j, passage in enumerate(split_into_passages(base.get('full_text') or base.get('summary_rss', '')))]
+        for base in base_articles
+    ]
+    for i in range(n):
+        article = dict(base_articles[i % len(base_articles)])
+        article['link'] = f"{article['link']}#synthetic-{i}"
+        article.setdefault('chunks', chunk_sets[i % len(base_articles)])
+        yield article
+
+
+def bench_ingest(raw_articles, feed_latency):
+    with FakeFeedServer(raw_articles, latency=feed_latency) as server:
+        ingest_rss.RSS_FEEDS = server.rss_feeds()
+        ingester = RSSIngester(polite_delay=0)
+
+        latencies = []
+        fetch_full_text = ingester.fetch_full_text
+
+        def timed_fetch(url):
+            start = time.perf_counter()
+            try:
+                return fetch_full_text(url)
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+        ingester.fetch_full_text = timed_fetch
+        start = time.perf_counter()
+        articles = ingester.ingest_feeds()
+        wall = time.perf_counter() - start
+
+    missing = sum(1 for a in articles if not a.get('full_text'))
+    return summarize(latencies, wall, errors=missing)
+
+
+def bench_process(raw_articles, groq):
+    processor = ArticleProcessor(client=groq)
+    latencies, errors = [], 0
+    start = time.perf_counter()
+    for article in raw_articles:
+        t0 = time.perf_counter()
+        result = processor.process_article(dict(article))
+        latencies.append(time.perf_counter() - t0)
+        if result.get('llm_summary') == "Processing Failed":
+            errors += 1
+    return summarize(latencies, time.perf_counter() - start, errors=errors)
+
+
+def bench_store(store, articles):
+    latencies, errors = [], 0
+    start = time.perf_counter()
+    for article in articles:
+        t0 = time.perf_counter()
+        if store.upsert_articles([article]) != 1:
+            errors += 1
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start, errors=errors)
+
+
+def bench_rag(store, groq, users, queries_per_user):
+    engine = RAGEngine(store, client=groq)
+
+    def chat_user(user_id):
+        user_latencies, user_errors = [], 0
+        for i in range(queries_per_user):
+            query = SAMPLE_QUERIES[(user_id + i) % len(SAMPLE_QUERIES)]
+            t0 = time.perf_counter()
+            answer = engine.answer_query(query)
+            user_latencies.append(time.perf_counter() - t0)
+            if answer.startswith("Error:"):
+                user_errors += 1
+        return user_latencies, user_errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        outcomes = list(pool.map(chat_user, range(users)))
+    wall = time.perf_counter() - start
+
+    latencies = [l for user_latencies, _ in outcomes for l in user_latencies]
+    return summarize(latencies, wall, errors=sum(e for _, e in outcomes))
+
+
+def bench_cold_start(runs, groq_latency, hash_embeddings):
+    """Cold start to first answer, each run in a fresh interpreter (see cold_start.py)."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cold_start.py')
+    cmd = [sys.executable, script, "--groq-latency", str(groq_latency)]
+    if hash_embeddings:
+        cmd.append("--hash-embeddings")
+
+    latencies, errors = [], 0
+    start = time.perf_counter()
+    for _ in range(runs):
+        out = subprocess.run(cmd, capture_output=True, text=True)
+        if out.returncode != 0:
+            errors += 1
+            continue
+        latencies.append(json.loads(out.stdout.strip().splitlines()[-1])["first_answer_s"])
+    return summarize(latencies, time.perf_counter() - start, errors=errors)
+
+
+# Options that only affect how a run is compared, not what it measures
+COMPARISON_OPTIONS = ("baseline", "threshold", "fail_on_regression")
+
+
+def comparable_config(config):
+    return {k: v for k, v in config.items() if k not in COMPARISON_OPTIONS}
+
+
+def find_baseline(explicit_path, config):
+    """Returns --baseline if given, else the newest saved run measured with the same configuration."""
+    if explicit_path:
+        return explicit_path
+    wanted = comparable_config(config)
+    for path in sorted(glob.glob(os.path.join(RESULTS_DIR, 'bench_*.json')), reverse=True):
+        if comparable_config(load_json(path).get('config', {})) == wanted:
+            return path
+    return None
+
+
+def compare(current, baseline, threshold):
+    """Prints a per-stage comparison and returns the list of regressed stages."""
+    regressions = []
+    print(f"\nComparison against {baseline['timestamp']} (threshold {threshold:.0%}):")
+    ours, theirs = comparable_config(current['config']), comparable_config(baseline.get('config', {}))
+    differing = sorted(k for k in set(ours) | set(theirs) if ours.get(k) != theirs.get(k))
+    if differing:
+        print(f"  warning: baseline was run with different options: {', '.join(differing)}")
+    for stage, now in current['stages'].items():
+        before = baseline['stages'].get(stage)
+        if not before:
+            print(f"  {stage:<22} (new)")
+            continue
+        p95_change = (now['p95_ms'] - before['p95_ms']) / before['p95_ms'] if before['p95_ms'] else 0.0
+        tput_change = ((now['throughput_per_s'] - before['throughput_per_s']) / before['throughput_per_s']
+                       if before['throughput_per_s'] else 0.0)
+        regressed = p95_change > threshold or tput_change < -threshold
+        flag = "REGRESSION" if regressed else "ok"
+        print(f"  {stage:<22} p95 {p95_change:+7.1%}  throughput {tput_change:+7.1%}  {flag}")
+        if regressed:
+            regressions.append(stage)
+    return regressions
+
+
+def print_table(stages):
+    print(f"\n{'stage':<22}{'count':>9}{'err':>6}{'ops/s':>12}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}")
+    for stage, r in stages.items():
+        print(f"{stage:<22}{r['count']:>9}{r['errors']:>6}{r['throughput_per_s']:>12.2f}"
+              f"{r['p50_ms']:>11.2f}{r['p95_ms']:>11.2f}{r['p99_ms']:>11.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline NewsStream AI benchmarks")
+    parser.add_argument("--scales", default="1000,10000",
+                        help="Comma separated synthetic article counts for store/RAG stages "
+                             "(100000+ is opt-in, see the module docstring)")
+    parser.add_argument("--users", type=int, default=4, help="Concurrent chat users for the RAG stage")
+    parser.add_argument("--queries-per-user", type=int, default=3)
+    parser.add_argument("--groq-latency", type=float, default=0.3, help="Mock Groq latency in seconds")
+    parser.add_argument("--groq-jitter", type=float, default=0.05)
+    parser.add_argument("--groq-429-rate", type=float, default=0.0, help="Fraction of Groq calls answered with 429")
+    parser.add_argument("--feed-latency", type=float, default=0.0, help="Fake RSS/HTTP server latency in seconds")
+    parser.add_argument("--hash-embeddings", action="store_true",
+                        help="Use deterministic hash vectors instead of loading the embedding model")
+    parser.add_argument("--cold-start-runs", type=int, default=3)
+    parser.add_argument("--skip", default="",
+                        help="Comma separated stages to skip (cold_start,ingest,process,store,rag)")
+    parser.add_argument("--baseline",
+                        help="Result file to compare against (default: latest run in benchmarks/results with the same options)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative change treated as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    if args.hash_embeddings:
+        process_llm.get_embeddings = hash_embeddings
+        rag_engine.get_embedding = hash_embedding
+
+    skip = {s.strip() for s in args.skip.split(",") if s.strip()}
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    raw_articles = load_json(RAW_PATH)
+    processed_articles = load_json(PROCESSED_PATH)
+
+    def make_groq():
+        return MockGroq(latency=args.groq_latency, jitter=args.groq_jitter, rate_limit_rate=args.groq_429_rate)
+
+    stages = {}
+    if "cold_start" not in skip:
+        print(f"Benchmarking cold start to first answer ({args.cold_start_runs} runs)...")
+        stages["cold_start"] = bench_cold_start(args.cold_start_runs, args.groq_latency, args.hash_embeddings)
+    if "ingest" not in skip:
+        print(f"Benchmarking ingest over {len(raw_articles)} captured articles...")
+        stages["ingest"] = bench_ingest(raw_articles, args.feed_latency)
+    if "process" not in skip:
+        print(f"Benchmarking process over {len(raw_articles)} captured articles...")
+        stages["process"] = bench_process(raw_articles, make_groq())
+
+    for scale in scales:
+        store = MongoStore(client=FakeMongoClient())
+        if "store" not in skip:
+            print(f"Benchmarking store at {scale} articles...")
+            stages[f"store@{scale}"] = bench_store(store, synthetic_articles(processed_articles, scale))
+        else:
+            for article in synthetic_articles(processed_articles, scale):
+                store.upsert_articles([article])
+        if "rag" not in skip:
+            print(f"Benchmarking RAG query at {scale} articles with {args.users} users...")
+            stages[f"rag_query@{scale}"] = bench_rag(store, make_groq(), args.users, args.queries_per_user)
+        del store
+
+    result = {
+        "timestamp": datetime.now().strftime("%Y%m%dT%H%M%S"),
+        "config": vars(args),
+        "stages": stages,
+    }
+    print_table(stages)
+
+    baseline_path = find_baseline(args.baseline, result['config'])
+    regressions = []
+    if baseline_path and os.path.exists(baseline_path):
+        regressions = compare(result, load_json(baseline_path), args.threshold)
+    else:
+        print("\nNo previous run with the same options to compare against.")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = os.path.join(RESULTS_DIR, f"bench_{result['timestamp']}.json")
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=4)
+    print(f"\nSaved results to {out_path}")
+
+    if regressions and args.fail_on_regression:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
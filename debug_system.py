@@ -8,7 +8,7 @@ import logging
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
 
 try:
-    from config import MONGO_URI, DB_NAME, COLLECTION_NAME
+    from config import MONGO_URI, DB_NAME, COLLECTION_NAME, CHUNKS_COLLECTION_NAME
     from utils_embeddings import get_embedding
     from rag_engine import RAGEngine, cosine_similarity
 except ImportError as e:
@@ -49,6 +49,11 @@ def diagnose():
         else:
             emb_len = len(sample_doc['embedding'])
             print(f"Sample document has embedding of length: {emb_len}")
+
+        chunk_count = db[CHUNKS_COLLECTION_NAME].count_documents({})
+        print(f"Passages in chunk index: {chunk_count}")
+        if chunk_count == 0:
+            print("WARNING: Chunk index is empty. Run src/repair_embeddings.py to backfill it.")
             
         # 4. Test Local Embedding Generation
         print("\nTesting Embedding Generation...")
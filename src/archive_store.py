@@ -0,0 +1,225 @@
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict, defaultdict
+from contextlib import closing
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+import pymongo
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+try:
+    from config import ARCHIVE_BACKEND, ARCHIVE_COLLECTION_NAME, ARCHIVE_DIR, ARCHIVE_CACHE_MONTHS
+except ImportError:
+    from src.config import ARCHIVE_BACKEND, ARCHIVE_COLLECTION_NAME, ARCHIVE_DIR, ARCHIVE_CACHE_MONTHS
+
+# Cold tier for articles moved out of the hot `articles` collection by
+# MongoStore.archive_old_articles. Both backends expose the same small API:
+#   write(docs), find_by_links(links), page(limit, after, filters), category_counts()
+# Archived articles are ordered newest first by (published_at, link).
+
+
+def _passes(doc: Dict, filters: Optional[Dict]) -> bool:
+    return all(doc.get(field) in values for field, values in (filters or {}).items() if values)
+
+
+class CollectionArchive:
+    """Cold tier as a separate MongoDB collection, off the dashboard/RAG working set."""
+
+    def __init__(self, db):
+        self.collection = db[ARCHIVE_COLLECTION_NAME]
+        self.collection.create_index("link", unique=True)
+        self.collection.create_index([("published_at", pymongo.DESCENDING), ("link", pymongo.DESCENDING)])
+
+    def write(self, docs: List[Dict]) -> int:
+        for doc in docs:
+            self.collection.update_one({"link": doc['link']}, {"$set": doc}, upsert=True)
+        return len(docs)
+
+    def find_by_links(self, links: List[str]) -> List[Dict]:
+        return list(self.collection.find({"link": {"$in": list(links)}}))
+
+    def page(self, limit: int, after: Optional[Tuple] = None, filters: Optional[Dict] = None) -> List[Dict]:
+        conditions = [{field: {"$in": list(values)}} for field, values in (filters or {}).items() if values]
+        if after is not None:
+            published_at, link = after
+            conditions.append({"$or": [
+                {"published_at": {"$lt": published_at}},
+                {"published_at": published_at, "link": {"$lt": link}},
+            ]})
+        query = {"$and": conditions} if conditions else {}
+        return list(
+            self.collection.find(query, {"embedding": 0, "full_text": 0})
+            .sort([("published_at", -1), ("link", -1)])
+            .limit(limit)
+        )
+
+    def category_counts(self) -> Dict:
+        pipeline = [{"$group": {"_id": "$category", "count": {"$sum": 1}}}]
+        return {row['_id']: row['count'] for row in self.collection.aggregate(pipeline)}
+
+
+class ZstdJsonlArchive:
+    """
+    Cold tier as zstd-compressed JSON Lines on local disk, one file per month of
+    `published_at` (articles-YYYY-MM.jsonl.zst). Writing merges into the month
+    file by link, so re-running the archival job is idempotent.
+
+    A SQLite sidecar (links.sqlite) maps each link to its month and category, so
+    lookups read at most one file per month involved and category counts read none.
+    Only the `cache_months` most recently used months are kept decompressed in memory.
+    """
+
+    def __init__(self, archive_dir=ARCHIVE_DIR, cache_months=ARCHIVE_CACHE_MONTHS):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("ARCHIVE_BACKEND='zstd_jsonl' requires the 'zstandard' package.") from e
+        self._zstd = zstandard
+        self.archive_dir = archive_dir
+        self.cache_months = cache_months
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(archive_dir, exist_ok=True)
+
+        self.index_path = os.path.join(archive_dir, "links.sqlite")
+        rebuild = not os.path.exists(self.index_path)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS links (link TEXT PRIMARY KEY, month TEXT NOT NULL, category TEXT)")
+        if rebuild and self._months():
+            self._rebuild_index()
+
+    def _connect(self):
+        # One short-lived connection per call keeps the sidecar safe across threads
+        return closing(sqlite3.connect(self.index_path))
+
+    def _rebuild_index(self):
+        """Indexes month files written before the sidecar existed."""
+        for month in self._months():
+            self._index_docs(month, self._read_month(month))
+
+    def _index_docs(self, month: str, docs: List[Dict]):
+        with self._connect() as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO links (link, month, category) VALUES (?, ?, ?)",
+                [(d['link'], month, d.get('category')) for d in docs]
+            )
+
+    def _path(self, month: str) -> str:
+        return os.path.join(self.archive_dir, f"articles-{month}.jsonl.zst")
+
+    def _months(self) -> List[str]:
+        names = [n for n in os.listdir(self.archive_dir) if n.startswith("articles-") and n.endswith(".jsonl.zst")]
+        months = sorted((n[len("articles-"):-len(".jsonl.zst")] for n in names), reverse=True)
+        # Undated articles sort after every dated one
+        return [m for m in months if m != "undated"] + [m for m in months if m == "undated"]
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, datetime):
+            return {"$date": value.isoformat()}
+        return str(value)  # ObjectId and other BSON types
+
+    @staticmethod
+    def _decode(obj):
+        if set(obj) == {"$date"}:
+            return datetime.fromisoformat(obj["$date"])
+        return obj
+
+    def _read_month(self, month: str) -> List[Dict]:
+        """Returns the month's articles sorted newest first, through a small LRU of decompressed months."""
+        path = self._path(month)
+        if not os.path.exists(path):
+            return []
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            cached = self._cache.get(month)
+            if cached and cached[0] == mtime:
+                self._cache.move_to_end(month)
+                return cached[1]
+
+        with open(path, 'rb') as f:
+            raw = self._zstd.ZstdDecompressor().decompress(f.read())
+        docs = [json.loads(line, object_hook=self._decode) for line in raw.decode('utf-8').splitlines() if line]
+        docs.sort(key=lambda d: (d.get('published_at') or datetime.min, d['link']), reverse=True)
+
+        with self._lock:
+            self._cache[month] = (mtime, docs)
+            self._cache.move_to_end(month)
+            while len(self._cache) > self.cache_months:
+                self._cache.popitem(last=False)
+        return docs
+
+    def write(self, docs: List[Dict]) -> int:
+        by_month = defaultdict(list)
+        for doc in docs:
+            published_at = doc.get('published_at')
+            by_month[published_at.strftime("%Y-%m") if published_at else "undated"].append(doc)
+
+        for month, new_docs in by_month.items():
+            merged = {d['link']: d for d in self._read_month(month)}
+            merged.update({d['link']: d for d in new_docs})
+            payload = "\n".join(json.dumps(d, default=self._encode) for d in merged.values()).encode('utf-8')
+
+            path = self._path(month)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                # content size lets decompress() size its output buffer in one go
+                f.write(self._zstd.ZstdCompressor(level=10, write_content_size=True).compress(payload))
+            os.replace(tmp_path, path)
+            # After the file, so an indexed link always resolves to a month that holds it
+            self._index_docs(month, new_docs)
+        return len(docs)
+
+    def _months_for(self, links: List[str]) -> Dict[str, List[str]]:
+        by_month = defaultdict(list)
+        links = list(links)
+        with self._connect() as conn:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(links), 500):
+                batch = links[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                for link, month in conn.execute(f"SELECT link, month FROM links WHERE link IN ({placeholders})", batch):
+                    by_month[month].append(link)
+        return by_month
+
+    def find_by_links(self, links: List[str]) -> List[Dict]:
+        found = []
+        for month, month_links in self._months_for(links).items():
+            wanted = set(month_links)
+            found += [doc for doc in self._read_month(month) if doc['link'] in wanted]
+        return found
+
+    def page(self, limit: int, after: Optional[Tuple] = None, filters: Optional[Dict] = None) -> List[Dict]:
+        after_key = (after[0] or datetime.min, after[1]) if after is not None else None
+        after_month = after[0].strftime("%Y-%m") if after is not None and after[0] else None
+        results = []
+        for month in self._months():
+            if after_month and month != "undated" and month > after_month:
+                continue
+            for doc in self._read_month(month):
+                if after_key is not None and (doc.get('published_at') or datetime.min, doc['link']) >= after_key:
+                    continue
+                if not _passes(doc, filters):
+                    continue
+                results.append({k: v for k, v in doc.items() if k not in ("embedding", "full_text")})
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def category_counts(self) -> Dict:
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT category, COUNT(*) FROM links GROUP BY category"))
+
+
+def load_archive(db, backend=ARCHIVE_BACKEND):
+    if backend == "collection":
+        return CollectionArchive(db)
+    if backend == "zstd_jsonl":
+        return ZstdJsonlArchive()
+    raise ValueError(f"Unknown archive backend '{backend}'. Expected 'collection' or 'zstd_jsonl'.")
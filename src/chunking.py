@@ -0,0 +1,34 @@
+
+import re
+import sys
+import os
+from typing import List
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+try:
+    from config import CHUNK_SIZE_WORDS, CHUNK_OVERLAP_WORDS
+except ImportError:
+    from src.config import CHUNK_SIZE_WORDS, CHUNK_OVERLAP_WORDS
+
+def split_into_passages(text: str, size=CHUNK_SIZE_WORDS, overlap=CHUNK_OVERLAP_WORDS) -> List[str]:
+    """
+    Splits text into overlapping word windows small enough for the embedding model,
+    so the whole article is searchable instead of only its first ~256 tokens.
+    """
+    words = re.sub(r"\s+", " ", text or "").strip().split(" ")
+    words = [w for w in words if w]
+    if not words:
+        return []
+
+    step = max(1, size - overlap)
+    passages = []
+    for start in range(0, len(words), step):
+        passages.append(" ".join(words[start:start + size]))
+        if start + size >= len(words):
+            break
+    return passages
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for budgeting English news text
+    return len(text or "") // 4 + 1
@@ -39,6 +39,24 @@ RSS_FEEDS = {
 MONGO_URI = "mongodb://localhost:27017/"
 DB_NAME = "news_stream_db"
 COLLECTION_NAME = "articles"
+CHUNKS_COLLECTION_NAME = "article_chunks"  # Passage-level vector index linked to articles by link
+
+# Hot/Cold Tiering
+HOT_RETENTION_DAYS = 30  # Articles older than this move out of the hot collection
+ARCHIVE_BACKEND = "collection"  # "collection" (MongoDB archive collection) or "zstd_jsonl" (compressed local files)
+ARCHIVE_COLLECTION_NAME = "articles_archive"
+ARCHIVE_CHUNKS_COLLECTION_NAME = "article_chunks_archive"  # Passages of archived articles, searched only for older dates
+ARCHIVE_DIR = "data/archive"
+ARCHIVE_CACHE_MONTHS = 2  # Decompressed month files kept in memory by the zstd_jsonl backend
+
+# Work Queue Configuration (distributed ingest/LLM workers)
+JOBS_COLLECTION_NAME = "jobs"
+JOB_LEASE_SECONDS = 120  # A claimed job is reclaimable once its lease expires
+JOB_HEARTBEAT_SECONDS = 30  # Workers extend their lease this often while a job runs
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_BASE_SECONDS = 10  # Exponential backoff between attempts (e.g. on Groq 429s)
+WORKER_POLL_SECONDS = 2
+JOB_RETENTION_SECONDS = 7 * 24 * 3600  # Done/failed jobs are dropped by a TTL index after this
 
 # LLM Configuration
 LLM_PROVIDER = "groq"
@@ -47,6 +65,17 @@ GROQ_MODEL = "llama-3.3-70b-versatile"
 
 # Embedding Configuration
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"  # Lightweight local model
+# Inference backend: "torch" (SentenceTransformer), "onnx" (ONNX Runtime fp32) or "onnx-int8" (dynamically quantized)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_DIR = "models/onnx"  # Exported/quantized ONNX models are cached here
+EMBEDDING_MAX_SEQ_LENGTH = 256  # all-MiniLM-L6-v2 max sequence length
+
+# Chunking / RAG Context Configuration
+CHUNK_SIZE_WORDS = 150  # Keeps each passage under the embedding model's max sequence length
+CHUNK_OVERLAP_WORDS = 30
+RAG_TOP_PASSAGES = 12  # Passages retrieved per query before grouping by article
+RAG_CONTEXT_TOKEN_BUDGET = 1500  # Upper bound on the context sent to the LLM
 
 # App Configuration
 UPDATE_INTERVAL_SECONDS = 300  # 5 minutes
+FEED_PAGE_SIZE = 20  # Live Feed cards rendered per page
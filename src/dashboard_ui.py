@@ -1,9 +1,11 @@
 
+import time
+_script_started_at = time.time()
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import threading
-import time
 import sys
 import os
 
@@ -12,27 +14,46 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
 try:
-    from src.config import RSS_FEEDS
+    from src.config import RSS_FEEDS, CATEGORIES, FEED_PAGE_SIZE, HOT_RETENTION_DAYS
     from src.ingest_rss import RSSIngester
     from src.process_llm import ArticleProcessor
     from src.store_mongo import MongoStore
     from src.rag_engine import RAGEngine
+    from src.utils_embeddings import warm_up_embedding_model, get_warmup_status
 except ImportError:
     # Fallback if running directly from src folder
     import sys
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from config import RSS_FEEDS
+    from config import RSS_FEEDS, CATEGORIES, FEED_PAGE_SIZE, HOT_RETENTION_DAYS
     from ingest_rss import RSSIngester
     from process_llm import ArticleProcessor
     from store_mongo import MongoStore
     from rag_engine import RAGEngine
+    from utils_embeddings import warm_up_embedding_model, get_warmup_status
 
-# Initialize Components
-mongo_store = MongoStore()
-rag_engine = RAGEngine(mongo_store)
+@st.cache_resource(show_spinner=False)
+def start_warm_up(_started_at):
+    """
+    Runs once per server process: loads the embedding model in the background so the
+    first chat query doesn't pay for it, and tracks cold-start-to-first-answer time.
+    """
+    warm_up_embedding_model(background=True)
+    return {"started_at": _started_at, "first_answer_s": None}
+
+@st.cache_resource(show_spinner=False)
+def init_components():
+    """One MongoClient (and one round of create_index calls) per server process, not per rerun."""
+    store = MongoStore()
+    return store, RAGEngine(store)
 
 st.set_page_config(page_title="NewsStream AI", layout="wide", page_icon="📰")
 
+# After set_page_config, which must be the first Streamlit command of the run
+startup = start_warm_up(_script_started_at)
+
+# Initialize Components
+mongo_store, rag_engine = init_components()
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -97,6 +118,12 @@ with st.sidebar:
             # 3. Storage Phase
             st.write("3. Storing and Indexing...")
             mongo_store.store_articles()
+
+            # 4. Tiering Phase
+            st.write(f"4. Archiving articles older than {HOT_RETENTION_DAYS} days...")
+            archived = mongo_store.archive_old_articles()
+            if archived:
+                st.success(f"Moved {archived} articles to the archive tier")
             
             status.update(label="Pipeline Complete!", state="complete", expanded=False)
 
@@ -118,6 +145,19 @@ with st.sidebar:
             help="Speed of Summarization + Classification + Sentiment Analysis"
         )
 
+    warmup = get_warmup_status()
+    st.metric(
+        label="Embedding Model Warm-up",
+        value=f"{warmup['seconds']:.2f}s" if warmup['seconds'] is not None else warmup['state'].title(),
+        help=warmup['error'] or "Background load of the embedding model at dashboard start"
+    )
+    if startup["first_answer_s"] is not None:
+        st.metric(
+            label="Cold Start → First Answer",
+            value=f"{startup['first_answer_s']:.2f}s",
+            help="Time from dashboard process start to the first chatbot answer"
+        )
+
     st.divider()
     st.header("Active Feeds")
     for cat, urls in RSS_FEEDS.items():
@@ -128,8 +168,8 @@ with st.sidebar:
 # Main Content Tabs
 tab1, tab2, tab3 = st.tabs(["📊 Dashboard", "💬 AI Chatbot", "📡 Live Feed"])
 
-# Fetch Data
-data = mongo_store.get_recent_articles(limit=100)
+# Fetch Data (embeddings and full text are never used by the charts)
+data = mongo_store.get_recent_articles(limit=100, projection={"embedding": 0, "full_text": 0})
 df = pd.DataFrame(data)
 
 with tab1:
@@ -173,21 +213,58 @@ with tab2:
             with st.spinner("Thinking..."):
                 response = rag_engine.answer_query(prompt)
                 st.markdown(response)
+        if startup["first_answer_s"] is None:
+            startup["first_answer_s"] = time.time() - startup["started_at"]
         
         st.session_state.messages.append({"role": "assistant", "content": response})
 
+# Live Feed paging state: a stack of keyset cursors, one per page visited
+if "feed_cursors" not in st.session_state:
+    st.session_state.feed_cursors = [None]
+
+def reset_feed_pages():
+    st.session_state.feed_cursors = [None]
+
+def next_feed_page(cursor):
+    st.session_state.feed_cursors.append(cursor)
+
+def prev_feed_page():
+    if len(st.session_state.feed_cursors) > 1:
+        st.session_state.feed_cursors.pop()
+
 with tab3:
     st.subheader("Latest Ingested Articles")
-    if not df.empty:
-        for index, row in df.iterrows():
+
+    # Filter chips are pushed down into the Mongo query
+    chip_col1, chip_col2, chip_col3 = st.columns(3)
+    feed_filters = {
+        "category": chip_col1.multiselect("Category", CATEGORIES + ["Unclassified"], key="feed_category", on_change=reset_feed_pages),
+        "sentiment": chip_col2.multiselect("Sentiment", ["Positive", "Negative", "Neutral"], key="feed_sentiment", on_change=reset_feed_pages),
+        "category_group": chip_col3.multiselect("Feed Group", list(RSS_FEEDS.keys()), key="feed_group", on_change=reset_feed_pages),
+    }
+
+    page_number = len(st.session_state.feed_cursors)
+    page_articles, next_cursor = mongo_store.get_articles_page(
+        page_size=FEED_PAGE_SIZE,
+        cursor=st.session_state.feed_cursors[-1],
+        filters=feed_filters
+    )
+
+    if page_articles:
+        for article in page_articles:
             with st.container():
                 st.markdown(f"""
                 <div class="stCard">
-                    <h3>{row.get('title')}</h3>
-                    <p style='color: #aaa; font-size: 0.8rem;'>{row.get('published')} | <b>{row.get('category')}</b> | {row.get('source_url')}</p>
-                    <p>{row.get('llm_summary')}</p>
-                    <span style='background-color: #333; padding: 2px 6px; border-radius: 4px; font-size: 0.8em;'>{row.get('sentiment')}</span>
+                    <h3>{article.get('title')}</h3>
+                    <p style='color: #aaa; font-size: 0.8rem;'>{article.get('published')} | <b>{article.get('category')}</b> | {article.get('source_url')}</p>
+                    <p>{article.get('llm_summary')}</p>
+                    <span style='background-color: #333; padding: 2px 6px; border-radius: 4px; font-size: 0.8em;'>{article.get('sentiment')}</span>
                 </div>
                 """, unsafe_allow_html=True)
     else:
         st.write("No articles found.")
+
+    nav_prev, nav_page, nav_next = st.columns([1, 2, 1])
+    nav_prev.button("← Newer", on_click=prev_feed_page, disabled=page_number == 1)
+    nav_page.caption(f"Page {page_number}")
+    nav_next.button("Older →", on_click=next_feed_page, args=(next_cursor,), disabled=next_cursor is None)
@@ -1,8 +1,4 @@
 
-import feedparser
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 import time
 import logging
 from datetime import datetime
@@ -28,7 +24,8 @@ logging.basicConfig(
 )
 
 class RSSIngester:
-    def __init__(self):
+    def __init__(self, polite_delay=1):
+        self.polite_delay = polite_delay
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -38,6 +35,10 @@ class RSSIngester:
         Fetches the full text content from a URL using BeautifulSoup.
         This attempts to get the main article content.
         """
+        # Imported lazily so importing this module stays cheap for the dashboard/CLI
+        import requests
+        from bs4 import BeautifulSoup
+
         try:
             response = requests.get(url, headers=self.headers, timeout=10)
             if response.status_code != 200:
@@ -63,6 +64,44 @@ class RSSIngester:
             logging.error(f"Error fetching full text for {url}: {e}")
             return None
 
+    def fetch_feed_entries(self, url, category):
+        """
+        Parses one RSS feed and returns its latest entries as article dictionaries,
+        without full text.
+        """
+        import feedparser
+
+        feed = feedparser.parse(url)
+
+        if feed.bozo:
+            logging.warning(f"Bozo exception parsing {url}: {feed.bozo_exception}")
+            # Continue anyway as some content might be parsed
+
+        articles = []
+        for entry in feed.entries[:5]: # Limit to latest 5 per feed for speed/demo
+            articles.append({
+                "source_url": url,
+                "category_group": category,
+                "title": entry.get('title', 'No Title'),
+                "link": entry.get('link', ''),
+                "published": entry.get('published', datetime.now().isoformat()),
+                "summary_rss": entry.get('summary', ''),
+                "full_text": None,
+                "ingested_at": datetime.now().isoformat()
+            })
+        return articles
+
+    def attach_full_text(self, article):
+        """Fetches the article's full text, falling back to the RSS summary."""
+        if article['link']:
+            logging.info(f"Fetching full text for: {article['title'][:30]}...")
+            full_text = self.fetch_full_text(article['link'])
+            if full_text:
+                article['full_text'] = full_text
+            else:
+                article['full_text'] = article['summary_rss'] # Fallback
+        return article
+
     def ingest_feeds(self):
         """
         Iterates through all configured feeds and fetches articles.
@@ -75,35 +114,9 @@ class RSSIngester:
             for url in urls:
                 logging.info(f"Fetching RSS: {url}")
                 try:
-                    feed = feedparser.parse(url)
-                    
-                    if feed.bozo:
-                        logging.warning(f"Bozo exception parsing {url}: {feed.bozo_exception}")
-                        # Continue anyway as some content might be parsed
-                        
-                    for entry in feed.entries[:5]: # Limit to latest 5 per feed for speed/demo
-                        article = {
-                            "source_url": url,
-                            "category_group": category,
-                            "title": entry.get('title', 'No Title'),
-                            "link": entry.get('link', ''),
-                            "published": entry.get('published', datetime.now().isoformat()),
-                            "summary_rss": entry.get('summary', ''),
-                            "full_text": None,
-                            "ingested_at": datetime.now().isoformat()
-                        }
-                        
-                        # Fetch full text
-                        if article['link']:
-                            logging.info(f"Fetching full text for: {article['title'][:30]}...")
-                            full_text = self.fetch_full_text(article['link'])
-                            if full_text:
-                                article['full_text'] = full_text
-                            else:
-                                article['full_text'] = article['summary_rss'] # Fallback
-                        
-                        all_articles.append(article)
-                        time.sleep(1) # Polite delay
+                    for article in self.fetch_feed_entries(url, category):
+                        all_articles.append(self.attach_full_text(article))
+                        time.sleep(self.polite_delay) # Polite delay
                         
                 except Exception as e:
                     logging.error(f"Error processing feed {url}: {e}")
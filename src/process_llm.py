@@ -3,29 +3,59 @@ import json
 import os
 import sys
 import logging
+import numpy as np
+from datetime import datetime
 from typing import List, Dict
-from groq import Groq
 
 # Ensure src is in path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
     from config import CATEGORIES, GROQ_API_KEY, GROQ_MODEL
-    from utils_embeddings import get_embedding
+    from utils_embeddings import get_embeddings
+    from chunking import split_into_passages
 except ImportError:
     from src.config import CATEGORIES, GROQ_API_KEY, GROQ_MODEL
-    from src.utils_embeddings import get_embedding
+    from src.utils_embeddings import get_embeddings
+    from src.chunking import split_into_passages
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
+def embed_article(article: Dict) -> Dict:
+    """
+    Splits the full text into overlapping passages and embeds them in one batch.
+    The passages become the chunk index used for retrieval; the article-level
+    embedding is their normalized mean.
+    """
+    text = article.get('full_text') or article.get('summary_rss') or article.get('title', '')
+    passages = split_into_passages(text)
+    if not passages:
+        article['embedding'] = []
+        article['chunks'] = []
+        return article
+
+    vectors = get_embeddings(passages)
+    article['chunks'] = [
+        {"chunk_index": i, "text": passage, "embedding": vector}
+        for i, (passage, vector) in enumerate(zip(passages, vectors))
+    ]
+    mean = np.mean(np.asarray(vectors, dtype=np.float32), axis=0)
+    article['embedding'] = (mean / (np.linalg.norm(mean) or 1.0)).tolist()
+    return article
+
 class ArticleProcessor:
-    def __init__(self):
-        self.client = Groq(api_key=GROQ_API_KEY)
+    def __init__(self, client=None):
+        if client is None:
+            # groq is imported on first use so importing this module doesn't pay for it
+            from groq import Groq
+            client = Groq(api_key=GROQ_API_KEY)
+        self.client = client
         self.model_name = GROQ_MODEL
 
-    def process_article(self, article: Dict) -> Dict:
+    def enrich_article(self, article: Dict) -> Dict:
         """
         Sends article text to LLM for Summarization, Classification, and Sentiment.
+        Raises on API/parse errors so callers (e.g. queue workers) can retry.
         """
         text = article.get('full_text', '') or article.get('summary_rss', '')
         # Truncate text if too long
@@ -49,36 +79,44 @@ class ArticleProcessor:
         }}
         """
 
+        logging.info(f"Processing article: {article.get('title')[:30]}...")
+
+        chat_completion = self.client.chat.completions.create(
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt,
+                }
+            ],
+            model=self.model_name,
+            response_format={"type": "json_object"},
+        )
+
+        result_json = chat_completion.choices[0].message.content
+        parsed_result = json.loads(result_json)
+
+        # Enrich original article
+        article['llm_summary'] = parsed_result.get('summary', 'Error generating summary')
+        article['category'] = parsed_result.get('category', 'Unclassified')
+        article['sentiment'] = parsed_result.get('sentiment', 'Neutral')
+        return article
+
+    def process_article(self, article: Dict) -> Dict:
+        """
+        Enriches the article with the LLM and generates its embeddings.
+        """
         try:
-            logging.info(f"Processing article: {article.get('title')[:30]}...")
+            self.enrich_article(article)
             
-            chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    }
-                ],
-                model=self.model_name,
-                response_format={"type": "json_object"},
-            )
-
-            result_json = chat_completion.choices[0].message.content
-            parsed_result = json.loads(result_json)
-            
-            # Enrich original article
-            article['llm_summary'] = parsed_result.get('summary', 'Error generating summary')
-            article['category'] = parsed_result.get('category', 'Unclassified')
-            article['sentiment'] = parsed_result.get('sentiment', 'Neutral')
-            
-            # Generate Embedding for RAG using local model
+            # Generate Embeddings for RAG using local model
             try:
-                article['embedding'] = get_embedding(text)
+                embed_article(article)
             except Exception as e:
                 logging.warning(f"Embedding generation failed: {e}")
                 article['embedding'] = []
+                article['chunks'] = []
 
-            article['processed_at'] = pd.Timestamp.now().isoformat()
+            article['processed_at'] = datetime.now().isoformat()
             
             return article
 
@@ -90,8 +128,6 @@ class ArticleProcessor:
             return article
 
     def process_batch(self, input_file="data/raw/latest_articles.json", output_file="data/processed/processed_articles.json"):
-        import pandas as pd 
-        
         if not os.path.exists(input_file):
             logging.error(f"Input file {input_file} not found.")
             return
@@ -2,33 +2,54 @@
 import numpy as np
 import logging
 from typing import List, Dict
-from groq import Groq
 import sys
 import os
+from datetime import datetime, timedelta, timezone
 
 # Ensure src is in path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
-    from config import GROQ_API_KEY, GROQ_MODEL
+    from config import GROQ_API_KEY, GROQ_MODEL, RAG_TOP_PASSAGES, RAG_CONTEXT_TOKEN_BUDGET, HOT_RETENTION_DAYS
     from utils_embeddings import get_embedding
+    from chunking import estimate_tokens
 except ImportError:
-    from src.config import GROQ_API_KEY, GROQ_MODEL
+    from src.config import GROQ_API_KEY, GROQ_MODEL, RAG_TOP_PASSAGES, RAG_CONTEXT_TOKEN_BUDGET, HOT_RETENTION_DAYS
     from src.utils_embeddings import get_embedding
+    from src.chunking import estimate_tokens
 
 # Basic cosine similarity
 def cosine_similarity(a, b):
     return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
 
+def published_on(date_filter: str) -> Dict:
+    """
+    Query condition for documents published on `date_filter` (YYYY-MM-DD), by their
+    parsed `published_at`. Documents without one (stored before it existed) fall back to
+    a string match on the raw `published` field, as do filters that aren't ISO dates.
+    """
+    text_match = {"published": {"$regex": date_filter, "$options": "i"}}
+    try:
+        day = datetime.strptime(date_filter, "%Y-%m-%d")
+    except ValueError:
+        return text_match
+    return {"$or": [
+        {"published_at": {"$gte": day, "$lt": day + timedelta(days=1)}},
+        {"published_at": None, **text_match},
+    ]}
+
 class RAGEngine:
-    def __init__(self, mongo_store):
+    def __init__(self, mongo_store, client=None):
         self.store = mongo_store
-        self.client = Groq(api_key=GROQ_API_KEY)
+        if client is None:
+            from groq import Groq
+            client = Groq(api_key=GROQ_API_KEY)
+        self.client = client
         self.model_name = GROQ_MODEL
 
     def retrieve(self, query: str, top_k=5, date_filter=None):
         """
         Retrieves relevant articles based on vector similarity.
-        Optionally filters by date (string match on Published field).
+        Optionally filters by publication date (see published_on).
         """
         try:
             # 1. Get Query Embedding locally
@@ -40,8 +61,8 @@ class RAGEngine:
             # 2. Build Query Filter
             mongo_query = {"embedding": {"$exists": True, "$ne": []}}
             if date_filter:
-                # Simple string match for date in published field (YYYY-MM-DD or similar)
-                mongo_query["published"] = {"$regex": date_filter, "$options": "i"}
+                # Feed dates are mostly RFC 822 strings, so match on the parsed published_at
+                mongo_query.update(published_on(date_filter))
 
             # 3. Fetch all candidates matching filter
             candidates = list(self.store.collection.find(mongo_query))
@@ -62,6 +83,110 @@ class RAGEngine:
             logging.error(f"Retrieval error: {e}")
             return []
 
+    def _needs_archive(self, date_filter) -> bool:
+        """Archived passages are only searched when the query asks for a date outside the hot window."""
+        try:
+            day = datetime.strptime(date_filter, "%Y-%m-%d")
+        except (TypeError, ValueError):
+            return False
+        return day < datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=HOT_RETENTION_DAYS)
+
+    def retrieve_passages(self, query: str, top_k=RAG_TOP_PASSAGES, date_filter=None, include_archive=None):
+        """
+        Retrieves the best matching passages from the chunk index.
+        Only hot passages are scanned unless `include_archive` is set, or (by default)
+        the query's date is older than HOT_RETENTION_DAYS.
+        Returns dicts with `score`, `article_link`, `chunk_index` and `text`.
+        """
+        try:
+            query_embedding = get_embedding(query)
+            if not query_embedding:
+                return []
+
+            if include_archive is None:
+                include_archive = self._needs_archive(date_filter)
+
+            # Score on vectors only; passage text is fetched for the winners below
+            projection = {"embedding": 1, "article_link": 1, "chunk_index": 1}
+            # Both tiers match dates the same way. Archived passages always carry
+            # published_at, so there it is a range on the published_at index.
+            mongo_query = {"embedding": {"$exists": True, "$ne": []}}
+            if date_filter:
+                mongo_query.update(published_on(date_filter))
+            tiers = [(self.store.chunks, mongo_query)]
+            if include_archive:
+                tiers.append((self.store.archived_chunks, mongo_query))
+
+            candidates = []
+            for tier, (collection, tier_query) in enumerate(tiers):
+                candidates += [(tier, c) for c in collection.find(tier_query, projection)]
+            if not candidates:
+                return []
+
+            # Score all passages in one matrix product
+            matrix = np.asarray([c['embedding'] for _, c in candidates], dtype=np.float32)
+            q = np.asarray(query_embedding, dtype=np.float32)
+            scores = matrix @ q / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(q) + 1e-12)
+
+            best = np.argsort(-scores)[:top_k]
+            texts = {}
+            for tier, (collection, _) in enumerate(tiers):
+                ids = [candidates[i][1]['_id'] for i in best if candidates[i][0] == tier]
+                if ids:
+                    texts[tier] = {
+                        doc['_id']: doc.get('text', "")
+                        for doc in collection.find({"_id": {"$in": ids}}, {"text": 1})
+                    }
+            return [
+                {
+                    "score": float(scores[i]),
+                    "article_link": candidates[i][1]['article_link'],
+                    "chunk_index": candidates[i][1]['chunk_index'],
+                    "text": texts[candidates[i][0]].get(candidates[i][1]['_id'], ""),
+                }
+                for i in best
+            ]
+
+        except Exception as e:
+            logging.error(f"Passage retrieval error: {e}")
+            return []
+
+    def build_context(self, passages: List[Dict], token_budget=RAG_CONTEXT_TOKEN_BUDGET):
+        """
+        Groups passages by article (best article first, passages in reading order)
+        and adds them until the token budget is used up.
+        """
+        groups = {}
+        for passage in passages:
+            groups.setdefault(passage['article_link'], []).append(passage)
+
+        articles = {
+            doc['link']: doc
+            for doc in self.store.find_articles_by_links(list(groups), {"title": 1, "published": 1, "link": 1})
+        }
+
+        sections = []
+        used = 0
+        for link, group in groups.items():
+            doc = articles.get(link, {})
+            header = f"Source: {doc.get('title')}\nDate: {doc.get('published')}"
+            body = []
+            cost = estimate_tokens(header)
+            for passage in sorted(group, key=lambda p: p['chunk_index']):
+                passage_cost = estimate_tokens(passage['text'])
+                if used + cost + passage_cost > token_budget:
+                    break
+                body.append(passage['text'])
+                cost += passage_cost
+            if not body:
+                if sections:
+                    break
+                continue
+            sections.append(header + "\nExcerpts:\n" + "\n...\n".join(body))
+            used += cost
+
+        return "\n\n".join(sections)
+
     def answer_query(self, query: str):
         """
         Generates an answer using RAG.
@@ -72,17 +197,23 @@ class RAGEngine:
         date_match = re.search(date_pattern, query)
         date_filter = date_match.group(0) if date_match else None
         
-        context_docs = self.retrieve(query, date_filter=date_filter)
-        if not context_docs:
+        # Prefer passages from the chunk index; articles stored before chunking
+        # fall back to article-level retrieval with their summaries.
+        context_text = ""
+        passages = self.retrieve_passages(query, date_filter=date_filter)
+        if passages:
+            context_text = self.build_context(passages)
+        else:
+            context_docs = self.retrieve(query, date_filter=date_filter)
+            context_text = "\n\n".join([f"Source: {doc.get('title')}\nDate: {doc.get('published')}\nSummary: {doc.get('llm_summary')}" for doc in context_docs])
+
+        if not context_text:
             if date_filter:
                 return f"No news found specifically for the date {date_filter} matching your query."
             return "No relevant news found to answer your query."
-
-        # Format context
-        context_text = "\n\n".join([f"Source: {doc.get('title')}\nDate: {doc.get('published')}\nSummary: {doc.get('llm_summary')}" for doc in context_docs])
         
         prompt = f"""
-        You are a News Intelligence Agent. Use the provided news summaries to answer the user's question.
+        You are a News Intelligence Agent. Use the provided news excerpts to answer the user's question.
         
         Rules:
         1. Answer strictly based on the provided context.
@@ -10,9 +10,13 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
     from config import MONGO_URI, DB_NAME, COLLECTION_NAME
     from utils_embeddings import get_embedding
+    from process_llm import embed_article
+    from store_mongo import MongoStore
 except ImportError:
     from src.config import MONGO_URI, DB_NAME, COLLECTION_NAME
     from src.utils_embeddings import get_embedding
+    from src.process_llm import embed_article
+    from src.store_mongo import MongoStore
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
@@ -65,5 +69,34 @@ def repair_embeddings():
             
     print(f"Repair Complete. Updated {updated_count} documents.")
 
+def repair_chunks():
+    """Backfills the passage chunk index for articles stored before chunking existed."""
+    store = MongoStore()
+    docs_to_repair = list(store.collection.find(
+        {"chunk_count": {"$exists": False}},
+        {"embedding": 0}
+    ))
+    print(f"Found {len(docs_to_repair)} documents needing chunk index entries.")
+
+    updated_count = 0
+
+    for doc in docs_to_repair:
+        try:
+            embed_article(doc)
+            store.store_chunks(doc, doc['chunks'])
+            store.collection.update_one(
+                {"_id": doc["_id"]},
+                {"$set": {"embedding": doc['embedding'], "chunk_count": len(doc['chunks'])}}
+            )
+            updated_count += 1
+            if updated_count % 5 == 0:
+                print(f"Chunked {updated_count} articles...")
+        except Exception as e:
+            print(f"Error chunking doc {doc.get('title', 'Unknown')}: {e}")
+
+    print(f"Chunk Repair Complete. Updated {updated_count} documents.")
+
 if __name__ == "__main__":
     repair_embeddings()
+    repair_chunks()
+    MongoStore().backfill_published_at()
@@ -4,27 +4,72 @@ import json
 import os
 import sys
 import logging
-from typing import List, Dict
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Optional, Tuple
 
 # Ensure src is in path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
-    from config import MONGO_URI, DB_NAME, COLLECTION_NAME
+    from config import (MONGO_URI, DB_NAME, COLLECTION_NAME, CHUNKS_COLLECTION_NAME, HOT_RETENTION_DAYS,
+                        ARCHIVE_CHUNKS_COLLECTION_NAME)
+    from archive_store import load_archive
 except ImportError:
-    from src.config import MONGO_URI, DB_NAME, COLLECTION_NAME
+    from src.config import (MONGO_URI, DB_NAME, COLLECTION_NAME, CHUNKS_COLLECTION_NAME, HOT_RETENTION_DAYS,
+                            ARCHIVE_CHUNKS_COLLECTION_NAME)
+    from src.archive_store import load_archive
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
+# Fields the Live Feed filter chips push down into the query
+FEED_FILTER_FIELDS = ("category", "sentiment", "category_group")
+
+def parse_published(article: Dict) -> Optional[datetime]:
+    """
+    Parses the feed's `published` string (RFC 822 or ISO 8601) into a naive UTC datetime,
+    falling back to `ingested_at`. Stored as `published_at` so articles sort chronologically.
+    """
+    for value in (article.get('published'), article.get('ingested_at')):
+        if not value:
+            continue
+        if isinstance(value, datetime):
+            parsed = value
+        else:
+            try:
+                parsed = parsedate_to_datetime(value)
+            except (TypeError, ValueError, IndexError):
+                try:
+                    parsed = datetime.fromisoformat(value)
+                except ValueError:
+                    continue
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+    return None
+
 class MongoStore:
-    def __init__(self):
+    def __init__(self, client=None):
         try:
-            self.client = pymongo.MongoClient(MONGO_URI)
+            self.client = client or pymongo.MongoClient(MONGO_URI)
             self.db = self.client[DB_NAME]
             self.collection = self.db[COLLECTION_NAME]
+            self.chunks = self.db[CHUNKS_COLLECTION_NAME]
+            # Cold tier for articles older than HOT_RETENTION_DAYS, and for their passages
+            self.archive = load_archive(self.db)
+            self.archived_chunks = self.db[ARCHIVE_CHUNKS_COLLECTION_NAME]
             
             # Create Index on Link (unique) to avoid duplicates
             self.collection.create_index("link", unique=True)
+            # Keyset pagination for the Live Feed: (published_at, _id), optionally behind a filter field
+            self.collection.create_index([("published_at", pymongo.DESCENDING), ("_id", pymongo.DESCENDING)])
+            for field in FEED_FILTER_FIELDS:
+                self.collection.create_index([(field, pymongo.ASCENDING), ("published_at", pymongo.DESCENDING), ("_id", pymongo.DESCENDING)])
+            # Chunks are looked up and replaced per article
+            self.chunks.create_index([("article_link", pymongo.ASCENDING), ("chunk_index", pymongo.ASCENDING)], unique=True)
+            self.archived_chunks.create_index([("article_link", pymongo.ASCENDING), ("chunk_index", pymongo.ASCENDING)], unique=True)
+            # Archived passages are only searched for a given (older) date
+            self.archived_chunks.create_index("published_at")
             logging.info("Connected to MongoDB and ensured indexes.")
         except Exception as e:
             logging.error(f"MongoDB Connection Error: {e}")
@@ -37,30 +82,178 @@ class MongoStore:
         with open(json_path, 'r', encoding='utf-8') as f:
             articles = json.load(f)
 
+        self.upsert_articles(articles)
+
+    def upsert_articles(self, articles: List[Dict]) -> int:
         count = 0
         for article in articles:
             try:
+                # Passages live in the chunk index, not on the article document
+                doc = {k: v for k, v in article.items() if k != 'chunks'}
+                chunks = article.get('chunks')
+                if chunks is not None:
+                    doc['chunk_count'] = len(chunks)
+                doc['published_at'] = parse_published(article)
+
                 # Upsert based on link
                 self.collection.update_one(
                     {"link": article['link']},
-                    {"$set": article},
+                    {"$set": doc},
                     upsert=True
                 )
+                if chunks is not None:
+                    self.store_chunks(article, chunks)
                 count += 1
             except Exception as e:
                 logging.error(f"Error storing article {article.get('title')}: {e}")
 
         logging.info(f"Successfully stored/updated {count} articles in MongoDB.")
+        return count
+
+    def store_chunks(self, article: Dict, chunks: List[Dict]):
+        """Replaces the chunk index entries for one article."""
+        self.chunks.delete_many({"article_link": article['link']})
+        if not chunks:
+            return
+        self.chunks.insert_many([
+            {
+                "article_link": article['link'],
+                "chunk_index": chunk['chunk_index'],
+                "text": chunk['text'],
+                "embedding": chunk['embedding'],
+                "published": article.get('published'),
+                "published_at": parse_published(article),
+            }
+            for chunk in chunks
+        ])
+
+    def get_recent_articles(self, limit=20, projection: Optional[Dict] = None):
+        docs = list(self.collection.find({}, projection).sort([("published_at", -1), ("_id", -1)]).limit(limit))
+        if len(docs) < limit:
+            # Hot tier is short (e.g. right after archiving): top up from the archive
+            docs += self.archive.page(limit - len(docs))
+        return docs
+
+    def get_articles_page(self, page_size=20, cursor: Optional[Tuple] = None, filters: Optional[Dict] = None):
+        """
+        Keyset pagination, newest first, across both tiers: the hot collection over
+        (published_at, _id), then the archive over (published_at, link).
+        `cursor` is the opaque `next_cursor` returned for the previous page (None for the first page);
+        `filters` maps FEED_FILTER_FIELDS to lists of accepted values.
+        Returns (articles, next_cursor), with next_cursor None on the last page.
+        """
+        filters = {field: values for field, values in (filters or {}).items() if field in FEED_FILTER_FIELDS and values}
+        tier = cursor[0] if cursor else "hot"
+
+        docs = []
+        if tier == "hot":
+            conditions = [{field: {"$in": list(values)}} for field, values in filters.items()]
+            if cursor is not None:
+                _, published_at, last_id = cursor
+                after_cursor = [{"published_at": published_at, "_id": {"$lt": last_id}}]
+                if published_at is not None:
+                    # Undated articles sort after every dated one
+                    after_cursor += [{"published_at": {"$lt": published_at}}, {"published_at": None}]
+                conditions.append({"$or": after_cursor})
 
-    def get_recent_articles(self, limit=20):
-        return list(self.collection.find().sort("published", -1).limit(limit))
+            query = {"$and": conditions} if conditions else {}
+            # Embeddings and full text are never rendered in the feed
+            projection = {"embedding": 0, "full_text": 0}
+            docs = list(
+                self.collection.find(query, projection)
+                .sort([("published_at", -1), ("_id", -1)])
+                .limit(page_size + 1)
+            )
+            if len(docs) > page_size:
+                docs = docs[:page_size]
+                return docs, ("hot", docs[-1].get('published_at'), docs[-1]['_id'])
+            after = None
+        else:
+            _, published_at, link = cursor
+            after = (published_at, link) if link is not None else None
+
+        # Hot tier exhausted: continue into the archive
+        remaining = page_size - len(docs)
+        archived = self.archive.page(remaining + 1, after=after, filters=filters)
+        if len(archived) <= remaining:
+            return docs + archived, None
+
+        archived = archived[:remaining]
+        if archived:
+            last = archived[-1]
+            return docs + archived, ("archive", last.get('published_at'), last['link'])
+        return docs, ("archive", None, None)
+
+    def find_articles_by_links(self, links: List[str], projection: Optional[Dict] = None) -> List[Dict]:
+        """Looks articles up in the hot tier, falling back to the archive for the rest."""
+        docs = list(self.collection.find({"link": {"$in": list(links)}}, projection))
+        missing = set(links) - {doc['link'] for doc in docs}
+        if missing:
+            docs += self.archive.find_by_links(list(missing))
+        return docs
+
+    def archive_old_articles(self, max_age_days=HOT_RETENTION_DAYS, batch_size=500) -> int:
+        """
+        Moves articles published more than `max_age_days` ago from the hot collection to the archive,
+        and their passages to the archived chunk index, so the hot passage scan stays bounded.
+        Each batch is written to the archive before it is deleted from the hot tier, so a rerun
+        after a failure only re-archives (idempotently, by link).
+        """
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=max_age_days)
+        total = 0
+        while True:
+            batch = list(self.collection.find({"published_at": {"$lt": cutoff}}).limit(batch_size))
+            if not batch:
+                break
+
+            ids = [doc.pop('_id') for doc in batch]
+            for doc in batch:
+                # The chunk index already holds this article's vectors
+                if doc.get('chunk_count'):
+                    doc.pop('embedding', None)
+            self.archive.write(batch)
+            self.archive_chunks(batch)
+            self.collection.delete_many({"_id": {"$in": ids}})
+            total += len(batch)
+
+        logging.info(f"Archived {total} articles older than {max_age_days} days.")
+        return total
+
+    def archive_chunks(self, articles: List[Dict]) -> int:
+        """Moves the given articles' passages from the chunk index to the archived chunk index."""
+        published_at = {doc['link']: doc.get('published_at') for doc in articles}
+        moved = 0
+        for chunk in self.chunks.find({"article_link": {"$in": list(published_at)}}):
+            chunk.pop('_id')
+            chunk['published_at'] = published_at[chunk['article_link']]
+            self.archived_chunks.update_one(
+                {"article_link": chunk['article_link'], "chunk_index": chunk['chunk_index']},
+                {"$set": chunk},
+                upsert=True
+            )
+            moved += 1
+        self.chunks.delete_many({"article_link": {"$in": list(published_at)}})
+        return moved
+
+    def backfill_published_at(self) -> int:
+        """Sets `published_at` on articles stored before it existed."""
+        count = 0
+        for doc in self.collection.find({"published_at": {"$exists": False}}, {"published": 1, "ingested_at": 1}):
+            self.collection.update_one({"_id": doc["_id"]}, {"$set": {"published_at": parse_published(doc)}})
+            count += 1
+        logging.info(f"Backfilled published_at on {count} articles.")
+        return count
 
     def get_stats(self):
         pipeline = [
             {"$group": {"_id": "$category", "count": {"$sum": 1}}}
         ]
-        return list(self.collection.aggregate(pipeline))
+        counts = {row['_id']: row['count'] for row in self.collection.aggregate(pipeline)}
+        for category, count in self.archive.category_counts().items():
+            counts[category] = counts.get(category, 0) + count
+        return [{"_id": category, "count": count} for category, count in counts.items()]
 
 if __name__ == "__main__":
     store = MongoStore()
     store.store_articles()
+    store.archive_old_articles()
@@ -1,24 +1,187 @@
 
+import inspect
 import logging
-from sentence_transformers import SentenceTransformer
 import sys
 import os
+import threading
+import time
+import numpy as np
 
-# Create a singleton for the model to avoid reloading it multiple times
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+try:
+    from config import EMBEDDING_MODEL, EMBEDDING_BACKEND, EMBEDDING_ONNX_DIR, EMBEDDING_MAX_SEQ_LENGTH
+except ImportError:
+    from src.config import EMBEDDING_MODEL, EMBEDDING_BACKEND, EMBEDDING_ONNX_DIR, EMBEDDING_MAX_SEQ_LENGTH
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+class TorchEmbeddingBackend:
+    """Reference backend: the full PyTorch SentenceTransformer."""
+
+    def __init__(self, model_name=EMBEDDING_MODEL):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name, device="cpu")
+
+    def encode(self, texts, batch_size=32):
+        return self.model.encode(list(texts), batch_size=batch_size, convert_to_numpy=True)
+
+
+class OnnxEmbeddingBackend:
+    """
+    ONNX Runtime backend reproducing SentenceTransformer's mean pooling + L2 normalization.
+    The model is exported once to `onnx_dir` (and dynamically quantized to int8 weights
+    when `quantized=True`); later loads only need onnxruntime and the tokenizer.
+    """
+
+    def __init__(self, model_name=EMBEDDING_MODEL, onnx_dir=EMBEDDING_ONNX_DIR, quantized=False,
+                 max_seq_length=EMBEDDING_MAX_SEQ_LENGTH):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.hub_name = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        self.model_dir = os.path.join(onnx_dir, self.hub_name.replace("/", "__"))
+        self.max_seq_length = max_seq_length
+
+        model_path = self.export(quantized)
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def export(self, quantized):
+        """Exports (and optionally quantizes) the model if it is not cached yet; returns the .onnx path."""
+        fp32_path = os.path.join(self.model_dir, "model.onnx")
+        int8_path = os.path.join(self.model_dir, "model_int8.onnx")
+
+        if not os.path.exists(fp32_path):
+            import torch
+            from transformers import AutoModel, AutoTokenizer
+
+            logging.info(f"Exporting {self.hub_name} to ONNX at {fp32_path}...")
+            os.makedirs(self.model_dir, exist_ok=True)
+            tokenizer = AutoTokenizer.from_pretrained(self.hub_name)
+            tokenizer.save_pretrained(self.model_dir)
+            model = AutoModel.from_pretrained(self.hub_name)
+            model.eval()
+
+            dummy = tokenizer(["export"], return_tensors="pt")
+            names = ["input_ids", "attention_mask", "token_type_ids"]
+            dynamic = {"batch": 0, "sequence": 1}
+            # Newer torch defaults to the dynamo exporter (needs onnxscript); this export
+            # targets the TorchScript-based one
+            legacy = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+            with torch.no_grad():
+                torch.onnx.export(
+                    model,
+                    tuple(dummy[n] for n in names),
+                    fp32_path,
+                    input_names=names,
+                    output_names=["last_hidden_state"],
+                    dynamic_axes={n: {v: k for k, v in dynamic.items()} for n in names + ["last_hidden_state"]},
+                    opset_version=14,
+                    **legacy,
+                )
+
+        if not quantized:
+            return fp32_path
+
+        if not os.path.exists(int8_path):
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+
+            logging.info(f"Quantizing {fp32_path} to int8...")
+            quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+        return int8_path
+
+    def encode(self, texts, batch_size=32):
+        texts = list(texts)
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            tokens = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            feed = {k: v.astype(np.int64) for k, v in tokens.items() if k in self.input_names}
+            hidden = self.session.run(None, feed)[0]
+
+            mask = tokens["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+        return np.vstack(batches) if batches else np.zeros((0, 0), dtype=np.float32)
+
+
+def load_backend(name=EMBEDDING_BACKEND, model_name=EMBEDDING_MODEL):
+    if name == "torch":
+        return TorchEmbeddingBackend(model_name)
+    if name == "onnx":
+        return OnnxEmbeddingBackend(model_name, quantized=False)
+    if name == "onnx-int8":
+        return OnnxEmbeddingBackend(model_name, quantized=True)
+    raise ValueError(f"Unknown embedding backend '{name}'. Expected one of {BACKENDS}.")
+
+
+# Create a singleton for the model to avoid reloading it multiple times.
+# The lock keeps a background warm-up and a first query from loading it twice.
 _model = None
+_model_lock = threading.Lock()
+_warmup = {"state": "idle", "seconds": None, "error": None}
 
 def get_embedding_model():
     global _model
     if _model is None:
+        with _model_lock:
+            if _model is None:
+                try:
+                    logging.info(f"Loading embedding model {EMBEDDING_MODEL} ({EMBEDDING_BACKEND} backend)...")
+                    _model = load_backend(EMBEDDING_BACKEND, EMBEDDING_MODEL)
+                    logging.info("Model loaded.")
+                except Exception as e:
+                    logging.error(f"Failed to load embedding model: {e}")
+                    raise e
+    return _model
+
+def warm_up_embedding_model(background=True):
+    """
+    Loads the embedding model and runs one encode so the first query doesn't pay for it.
+    Returns the warm-up thread when `background` is True.
+    """
+    def _run():
+        start = time.perf_counter()
+        _warmup.update(state="loading", error=None)
         try:
-            logging.info("Loading SentenceTransformer model...")
-            _model = SentenceTransformer('all-MiniLM-L6-v2')
-            logging.info("Model loaded.")
+            get_embedding_model().encode(["warm-up"])
+            _warmup.update(state="ready", seconds=time.perf_counter() - start)
         except Exception as e:
-            logging.error(f"Failed to load embedding model: {e}")
-            raise e
-    return _model
+            _warmup.update(state="failed", error=str(e))
+
+    if not background:
+        _run()
+        return None
+    thread = threading.Thread(target=_run, name="embedding-warmup", daemon=True)
+    thread.start()
+    return thread
+
+def get_warmup_status():
+    return dict(_warmup)
 
 def get_embedding(text):
     model = get_embedding_model()
-    return model.encode(text).tolist()
+    return model.encode([text])[0].tolist()
+
+def get_embeddings(texts, batch_size=32):
+    model = get_embedding_model()
+    return [vec.tolist() for vec in model.encode(texts, batch_size=batch_size)]
+
+if __name__ == "__main__":
+    # Pre-build the ONNX artifacts for the configured backend, e.g.
+    #   EMBEDDING_BACKEND=onnx-int8 python src/utils_embeddings.py
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+    get_embedding_model()
+    print(f"Embedding backend '{EMBEDDING_BACKEND}' ready.")
@@ -0,0 +1,309 @@
+
+import argparse
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import pymongo
+from pymongo import ReturnDocument
+
+# Ensure src is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+try:
+    from config import (RSS_FEEDS, UPDATE_INTERVAL_SECONDS, JOBS_COLLECTION_NAME, JOB_LEASE_SECONDS,
+                        JOB_HEARTBEAT_SECONDS, JOB_MAX_ATTEMPTS, JOB_RETRY_BASE_SECONDS, WORKER_POLL_SECONDS,
+                        JOB_RETENTION_SECONDS)
+    from store_mongo import MongoStore
+except ImportError:
+    from src.config import (RSS_FEEDS, UPDATE_INTERVAL_SECONDS, JOBS_COLLECTION_NAME, JOB_LEASE_SECONDS,
+                            JOB_HEARTBEAT_SECONDS, JOB_MAX_ATTEMPTS, JOB_RETRY_BASE_SECONDS, WORKER_POLL_SECONDS,
+                            JOB_RETENTION_SECONDS)
+    from src.store_mongo import MongoStore
+
+# Configure Logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+# Job types, in pipeline order. Each article-level job is keyed on the article link.
+FEED_FETCH = "feed_fetch"
+FULL_TEXT_FETCH = "full_text_fetch"
+LLM_ENRICH = "llm_enrich"
+EMBED = "embed"
+JOB_TYPES = (FEED_FETCH, FULL_TEXT_FETCH, LLM_ENRICH, EMBED)
+
+def _now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class JobQueue:
+    """
+    MongoDB-backed job queue shared by any number of worker processes/nodes.
+
+    Jobs are unique on (type, key), so enqueueing is idempotent. Workers claim a job
+    atomically with a time-limited lease, extend it with heartbeats while working,
+    and the job becomes claimable again if the lease expires (e.g. the worker died).
+    Failed attempts are retried with exponential backoff up to JOB_MAX_ATTEMPTS; an
+    expired lease counts as a failed attempt. Finished jobs drop their payload and are
+    deleted JOB_RETENTION_SECONDS later by a TTL index on `finished_at`.
+    """
+
+    def __init__(self, db):
+        self.collection = db[JOBS_COLLECTION_NAME]
+        self.collection.create_index([("type", pymongo.ASCENDING), ("key", pymongo.ASCENDING)], unique=True)
+        self.collection.create_index([("status", pymongo.ASCENDING), ("type", pymongo.ASCENDING), ("available_at", pymongo.ASCENDING)])
+        self.collection.create_index([("status", pymongo.ASCENDING), ("lease_expires_at", pymongo.ASCENDING)])
+        # Only done/failed jobs have `finished_at`, so pending and running jobs never expire
+        self.collection.create_index("finished_at", expireAfterSeconds=JOB_RETENTION_SECONDS)
+
+    def enqueue(self, job_type: str, key: str, payload: Dict, delay_seconds=0) -> bool:
+        """Adds a job unless one with the same (type, key) exists. Returns True if it was created."""
+        now = _now()
+        result = self.collection.update_one(
+            {"type": job_type, "key": key},
+            {"$setOnInsert": {
+                "type": job_type,
+                "key": key,
+                "payload": payload,
+                "status": "pending",
+                "attempts": 0,
+                "available_at": now + timedelta(seconds=delay_seconds),
+                "created_at": now,
+            }},
+            upsert=True
+        )
+        return result.upserted_id is not None
+
+    def fail_expired(self) -> int:
+        """
+        Marks jobs failed whose lease expired on their last attempt, e.g. a job that
+        keeps killing its worker (OOM, segfault) and would otherwise be re-claimed forever.
+        """
+        now = _now()
+        result = self.collection.update_many(
+            {"status": "running", "lease_expires_at": {"$lt": now}, "attempts": {"$gte": JOB_MAX_ATTEMPTS}},
+            {
+                "$set": {"status": "failed", "last_error": "lease expired on the final attempt", "finished_at": now},
+                "$unset": {"lease_owner": "", "lease_expires_at": ""},
+            }
+        )
+        if result.modified_count:
+            logging.warning(f"Failed {result.modified_count} jobs whose lease expired on the final attempt.")
+        return result.modified_count
+
+    def claim(self, worker_id: str, job_types=JOB_TYPES) -> Optional[Dict]:
+        """Atomically leases the oldest available job (or one whose lease expired with attempts left)."""
+        self.fail_expired()
+        now = _now()
+        return self.collection.find_one_and_update(
+            {
+                "type": {"$in": list(job_types)},
+                "$or": [
+                    {"status": "pending", "available_at": {"$lte": now}},
+                    {"status": "running", "lease_expires_at": {"$lt": now}, "attempts": {"$lt": JOB_MAX_ATTEMPTS}},
+                ],
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "lease_owner": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=JOB_LEASE_SECONDS),
+                    "started_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("available_at", pymongo.ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _update_owned(self, job: Dict, worker_id: str, update: Dict) -> bool:
+        # Only the current lease holder may touch a running job
+        result = self.collection.update_one(
+            {"_id": job["_id"], "status": "running", "lease_owner": worker_id},
+            update
+        )
+        return result.matched_count == 1
+
+    def heartbeat(self, job: Dict, worker_id: str) -> bool:
+        """Extends the lease. Returns False if the lease was lost to another worker."""
+        return self._update_owned(job, worker_id, {"$set": {
+            "lease_expires_at": _now() + timedelta(seconds=JOB_LEASE_SECONDS)
+        }})
+
+    def complete(self, job: Dict, worker_id: str) -> bool:
+        # The payload (possibly a full article) is only needed while the job can still run
+        return self._update_owned(job, worker_id, {
+            "$set": {"status": "done", "finished_at": _now()},
+            "$unset": {"payload": "", "lease_owner": "", "lease_expires_at": ""},
+        })
+
+    def fail(self, job: Dict, worker_id: str, error: str) -> bool:
+        if job.get("attempts", 0) >= JOB_MAX_ATTEMPTS:
+            update = {"$set": {"status": "failed", "last_error": error, "finished_at": _now()}}
+        else:
+            backoff = JOB_RETRY_BASE_SECONDS * 2 ** (job.get("attempts", 1) - 1)
+            update = {"$set": {
+                "status": "pending",
+                "last_error": error,
+                "available_at": _now() + timedelta(seconds=backoff),
+            }}
+        update["$unset"] = {"lease_owner": "", "lease_expires_at": ""}
+        return self._update_owned(job, worker_id, update)
+
+    def stats(self) -> List[Dict]:
+        pipeline = [
+            {"$group": {"_id": {"type": "$type", "status": "$status"}, "count": {"$sum": 1}}}
+        ]
+        return list(self.collection.aggregate(pipeline))
+
+def schedule_feed_fetches(queue: JobQueue, feeds=RSS_FEEDS, interval_seconds=UPDATE_INTERVAL_SECONDS) -> int:
+    """
+    Enqueues one feed_fetch job per feed for the current interval window.
+    Keys include the window, so several schedulers running at once don't duplicate work.
+    """
+    window = int(time.time() // interval_seconds)
+    created = 0
+    for category, urls in feeds.items():
+        for url in urls:
+            if queue.enqueue(FEED_FETCH, f"{url}@{window}", {"url": url, "category": category}):
+                created += 1
+    logging.info(f"Scheduled {created} feed fetch jobs for window {window}.")
+    return created
+
+class Worker:
+    """
+    Pulls jobs from the queue and runs the RSSIngester / ArticleProcessor step for each,
+    enqueueing the next step on success. The final embed step upserts the article by link,
+    so a job that runs twice (e.g. after a lost lease) leaves the same result.
+    """
+
+    def __init__(self, queue: JobQueue, store: MongoStore, job_types=JOB_TYPES, worker_id=None,
+                 ingester=None, processor=None):
+        self.queue = queue
+        self.store = store
+        self.job_types = list(job_types)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._ingester = ingester
+        self._processor = processor
+        self.handlers = {
+            FEED_FETCH: self.handle_feed_fetch,
+            FULL_TEXT_FETCH: self.handle_full_text_fetch,
+            LLM_ENRICH: self.handle_llm_enrich,
+            EMBED: self.handle_embed,
+        }
+
+    @property
+    def ingester(self):
+        if self._ingester is None:
+            from ingest_rss import RSSIngester
+            self._ingester = RSSIngester()
+        return self._ingester
+
+    @property
+    def processor(self):
+        # Each worker holds its own Groq connection
+        if self._processor is None:
+            from process_llm import ArticleProcessor
+            self._processor = ArticleProcessor()
+        return self._processor
+
+    def handle_feed_fetch(self, payload: Dict):
+        articles = [a for a in self.ingester.fetch_feed_entries(payload['url'], payload['category']) if a['link']]
+        known = {doc['link'] for doc in self.store.find_articles_by_links([a['link'] for a in articles], {"link": 1})}
+        for article in articles:
+            if article['link'] not in known:
+                self.queue.enqueue(FULL_TEXT_FETCH, article['link'], article)
+
+    def handle_full_text_fetch(self, article: Dict):
+        self.ingester.attach_full_text(article)
+        self.queue.enqueue(LLM_ENRICH, article['link'], article)
+
+    def handle_llm_enrich(self, article: Dict):
+        self.processor.enrich_article(article)
+        self.queue.enqueue(EMBED, article['link'], article)
+
+    def handle_embed(self, article: Dict):
+        from process_llm import embed_article
+        embed_article(article)
+        article['processed_at'] = datetime.now().isoformat()
+        if self.store.upsert_articles([article]) != 1:
+            raise RuntimeError(f"Failed to store {article['link']}")
+
+    def _run_with_heartbeat(self, job: Dict):
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(JOB_HEARTBEAT_SECONDS):
+                if not self.queue.heartbeat(job, self.worker_id):
+                    logging.warning(f"Lost lease on {job['type']} {job['key']}")
+                    return
+
+        heartbeat = threading.Thread(target=beat, name=f"heartbeat-{job['_id']}", daemon=True)
+        heartbeat.start()
+        try:
+            self.handlers[job['type']](job['payload'])
+        finally:
+            stop.set()
+            heartbeat.join()
+
+    def run_once(self) -> bool:
+        """Claims and runs one job. Returns False when no job was available."""
+        job = self.queue.claim(self.worker_id, self.job_types)
+        if job is None:
+            return False
+
+        try:
+            self._run_with_heartbeat(job)
+        except Exception as e:
+            logging.error(f"{job['type']} failed for {job['key']} (attempt {job.get('attempts')}): {e}")
+            self.queue.fail(job, self.worker_id, str(e))
+            return True
+
+        if not self.queue.complete(job, self.worker_id):
+            logging.warning(f"Completed {job['type']} {job['key']} after losing its lease")
+        return True
+
+    def run(self, max_jobs=None, stop_when_idle=False):
+        processed = 0
+        logging.info(f"Worker {self.worker_id} started for {self.job_types}")
+        while max_jobs is None or processed < max_jobs:
+            if self.run_once():
+                processed += 1
+            elif stop_when_idle:
+                break
+            else:
+                time.sleep(WORKER_POLL_SECONDS)
+        return processed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NewsStream AI distributed work queue")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    schedule_parser = subparsers.add_parser("schedule", help="Enqueue feed fetch jobs")
+    schedule_parser.add_argument("--loop", action="store_true", help=f"Repeat every {UPDATE_INTERVAL_SECONDS}s")
+
+    worker_parser = subparsers.add_parser("worker", help="Run a worker")
+    worker_parser.add_argument("--types", default=",".join(JOB_TYPES), help="Comma separated job types to pull")
+    worker_parser.add_argument("--max-jobs", type=int)
+    worker_parser.add_argument("--stop-when-idle", action="store_true")
+
+    subparsers.add_parser("stats", help="Show job counts by type and status")
+    args = parser.parse_args()
+
+    store = MongoStore()
+    queue = JobQueue(store.db)
+
+    if args.command == "schedule":
+        while True:
+            schedule_feed_fetches(queue)
+            if not args.loop:
+                break
+            time.sleep(UPDATE_INTERVAL_SECONDS)
+    elif args.command == "worker":
+        job_types = [t.strip() for t in args.types.split(",") if t.strip()]
+        Worker(queue, store, job_types).run(max_jobs=args.max_jobs, stop_when_idle=args.stop_when_idle)
+    else:
+        for row in queue.stats():
+            print(f"{row['_id']['type']:<16} {row['_id']['status']:<8} {row['count']}")